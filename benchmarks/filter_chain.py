@@ -0,0 +1,98 @@
+"""
+Compares filtering a batch of messages with each filter in turn against the filters compiled by compile_filters, and
+against a FilteredNotification looking up the messages from its source in a MessageBatch. Also compares several
+notifications declaring the same filters with and without sharing their results through a FilterResults.
+
+    python benchmarks/filter_chain.py [messages]
+"""
+import sys
+import timeit
+
+from doodledashboard.datafeeds.datafeed import Message, MessageBatch
+from doodledashboard.filters.contains_text import ContainsTextFilter
+from doodledashboard.filters.filter import compile_filters, FilterResults
+from doodledashboard.filters.matches_regex import MatchesRegexFilter
+from doodledashboard.filters.message_from_source import MessageFromSourceFilter
+from doodledashboard.notifications.notification import FilteredNotification
+from doodledashboard.notifications.text.text import TextInMessage
+
+_REPEAT = 5
+_SOURCES = ["rss", "slack", "weather", "datetime", "text"]
+_NOTIFICATIONS = 4
+
+
+def create_messages(count):
+    return [
+        Message("Message %s about the %s" % (number, ["weather", "news", "build"][number % 3]),
+                _SOURCES[number % len(_SOURCES)])
+        for number in range(count)
+    ]
+
+
+def create_filters():
+    # Listed most expensive first, as they might be in a dashboard's configuration
+    return [MatchesRegexFilter(r"message \d+ about"), ContainsTextFilter("weather"), MessageFromSourceFilter("rss")]
+
+
+def filter_each_in_turn(filters, messages):
+    def keep(message):
+        for f in filters:
+            if f.filter(message) is False:
+                return False
+        return True
+
+    return list(filter(keep, messages))
+
+
+def filter_compiled(keep, messages):
+    return [message for message in messages if keep(message)]
+
+
+def create_notifications(filter_results):
+    return [
+        FilteredNotification(TextInMessage(), [MatchesRegexFilter(r"(weather|news).*\d+$")], filter_results)
+        for _ in range(_NOTIFICATIONS)
+    ]
+
+
+def filter_for_each(notifications, messages):
+    batch = MessageBatch(messages)
+    return [notification.filter_messages(batch) for notification in notifications]
+
+
+def microseconds_per_message(function, messages):
+    seconds = min(timeit.repeat(function, number=1, repeat=_REPEAT))
+    return seconds * 1000000 / len(messages)
+
+
+def main(count):
+    messages = create_messages(count)
+    filters = create_filters()
+    keep = compile_filters(filters)
+    notification = FilteredNotification(TextInMessage(), filters)
+    batch = MessageBatch(messages)
+
+    assert filter_each_in_turn(filters, messages) == filter_compiled(keep, messages)
+    assert filter_compiled(keep, messages) == notification.filter_messages(batch)
+
+    each_in_turn = microseconds_per_message(lambda: filter_each_in_turn(filters, messages), messages)
+    compiled = microseconds_per_message(lambda: filter_compiled(keep, messages), messages)
+    indexed = microseconds_per_message(lambda: notification.filter_messages(MessageBatch(messages)), messages)
+
+    separate_notifications, shared_notifications = create_notifications(None), create_notifications(FilterResults())
+    assert filter_for_each(separate_notifications, messages) == filter_for_each(shared_notifications, messages)
+
+    separate = microseconds_per_message(lambda: filter_for_each(separate_notifications, messages), messages)
+    shared = microseconds_per_message(lambda: filter_for_each(shared_notifications, messages), messages)
+
+    print("%d messages, %d filters" % (count, len(filters)))
+    print("Each filter in turn: %.3fus per message" % each_in_turn)
+    print("Compiled filters:    %.3fus per message (%.1fx faster)" % (compiled, each_in_turn / compiled))
+    print("Indexed by source:   %.3fus per message (%.1fx faster)" % (indexed, each_in_turn / indexed))
+    print("%d notifications with the same filters" % _NOTIFICATIONS)
+    print("Separate results:    %.3fus per message" % separate)
+    print("Shared results:      %.3fus per message (%.1fx faster)" % (shared, separate / shared))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
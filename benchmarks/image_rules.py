@@ -0,0 +1,63 @@
+"""
+Compares choosing an image by trying each image's filter in turn against the filters combined by RuleMatcher.
+
+    python benchmarks/image_rules.py [rules]
+"""
+import sys
+import timeit
+
+from doodledashboard.datafeeds.datafeed import Message
+from doodledashboard.filters.contains_text import ContainsTextFilter
+from doodledashboard.filters.matches_regex import MatchesRegexFilter
+from doodledashboard.filters.rule_matcher import RuleMatcher
+
+_CALLS = 10000
+_REPEAT = 5
+
+
+def create_filters(count):
+    return [
+        ContainsTextFilter("status %d" % rule) if rule % 2 else MatchesRegexFilter(r"build #%d (?:passed|failed)" % rule)
+        for rule in range(count)
+    ]
+
+
+def create_messages(count):
+    return [
+        Message("Nothing to report"),
+        Message("Deployed with status %d" % (count // 2 | 1)),
+        Message("Latest build #%d passed after a long wait for the tests" % (count - 2)),
+    ]
+
+
+def last_match_of_each(filters, message):
+    last_match = None
+    for index, message_filter in enumerate(filters):
+        if message_filter.filter(message):
+            last_match = index
+
+    return last_match
+
+
+def microseconds_per_message(function):
+    return min(timeit.repeat(function, number=_CALLS, repeat=_REPEAT)) * 1000000 / _CALLS
+
+
+def main(count):
+    filters = create_filters(count)
+    matcher = RuleMatcher(filters)
+    assert matcher.combined
+
+    print("%d rules" % count)
+    for message in create_messages(count):
+        assert last_match_of_each(filters, message) == matcher.last_match(message)
+
+        each = microseconds_per_message(lambda: last_match_of_each(filters, message))
+        combined = microseconds_per_message(lambda: matcher.last_match(message))
+
+        print("'%s'" % message.text)
+        print("  Each rule in turn: %.2fus, combined: %.2fus (%.1fx faster)" % (each, combined, each / combined))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 30)
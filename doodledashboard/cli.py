@@ -9,8 +9,10 @@ from yaml import YAMLError
 from doodledashboard import __about__
 from doodledashboard.component import ExternalPackageSource, StaticComponentSource, ComponentCreatorLoader, ComponentType
 from doodledashboard.configuration import DashboardConfigReader, InvalidConfigurationException
-from doodledashboard.dashboard import DashboardRunner, DashboardValidator, ValidationException
-from doodledashboard.datafeeds.datafeed import MessageJsonEncoder
+from doodledashboard.dashboard import DashboardRunner, DashboardValidator, ValidationException, \
+    BackgroundDashboardRunner
+from doodledashboard.datafeeds.circuit_breaker import CircuitBreakerDataFeed
+from doodledashboard.datafeeds.datafeed import MessageJsonEncoder, iter_data_feed_layers
 from doodledashboard.error_messages import get_error_message
 from doodledashboard.notifications.notification import FilteredNotification
 from doodledashboard.secrets_store import InvalidSecretsException, try_read_secrets_file, SecretNotFound
@@ -39,9 +41,10 @@ def is_remote_file(file_path):
 
 
 def read_remote_file(file_path):
-    import urllib.request
-    with urllib.request.urlopen(file_path) as response:
-        return response.read()
+    from doodledashboard.http import get_session, DEFAULT_TIMEOUT
+    response = get_session().get(file_path, timeout=DEFAULT_TIMEOUT)
+    response.raise_for_status()
+    return response.content
 
 
 def read_file(config_file):
@@ -100,8 +103,9 @@ def start(dashboards, once, secrets):
 
     click.echo("Dashboard running...")
 
+    runner = create_runner(dashboard, once)
     while True:
-        DashboardRunner(dashboard).cycle()
+        runner.cycle()
 
         if once:
             break
@@ -135,7 +139,10 @@ def view(action, dashboards, secrets):
 
     messages = DashboardRunner(dashboard).poll_datafeeds()
 
-    cli_output = {"source-data": messages}
+    cli_output = {
+        "source-data": messages,
+        "circuit-breakers": describe_circuit_breakers(dashboard.data_feeds)
+    }
 
     if action == "notifications":
         cli_output["notifications"] = []
@@ -195,6 +202,13 @@ def read_dashboard_from_config(dashboard_config, configs):
         raise
 
 
+def create_runner(dashboard, once):
+    if dashboard.background_interval is not None and not once:
+        return BackgroundDashboardRunner(dashboard, dashboard.background_interval)
+
+    return DashboardRunner(dashboard)
+
+
 def initialise_component_loader():
     configs = ComponentCreatorLoader()
     configs.add_source(ExternalPackageSource())
@@ -202,6 +216,21 @@ def initialise_component_loader():
     return configs
 
 
+def describe_circuit_breakers(data_feeds):
+    circuit_breakers = []
+    for data_feed in data_feeds:
+        for layer in iter_data_feed_layers(data_feed):
+            if isinstance(layer, CircuitBreakerDataFeed):
+                circuit_breakers.append({
+                    "data-feed": data_feed.name or str(data_feed),
+                    "state": layer.state,
+                    "failures": layer.failures,
+                    "seconds-until-retry": layer.seconds_until_retry
+                })
+
+    return circuit_breakers
+
+
 def explain_dashboard(dashboard):
     display = dashboard.display
     click.echo("Display loaded: %s" % str(display))
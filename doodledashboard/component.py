@@ -152,6 +152,15 @@ class MissingRequiredOptionException(ComponentCreationException):
         super().__init__(message)
 
 
+class InvalidOptionException(ComponentCreationException):
+    """
+    Raised when an option is present but its value can't be used
+    """
+
+    def __init__(self, message):
+        super().__init__(message)
+
+
 class ComponentType(Enum):
     DISPLAY = 1
     DATA_FEED = 2
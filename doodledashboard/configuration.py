@@ -1,9 +1,16 @@
+import os
+
 import yaml
 
 from functools import reduce
 
 from doodledashboard.component import ComponentType
 from doodledashboard.dashboard import Dashboard
+from doodledashboard.datafeeds.circuit_breaker import CircuitBreakerDataFeed
+from doodledashboard.datafeeds.poller import SequentialPoller, ThreadedPoller, AsyncioPoller, TimeLimitedPoller
+from doodledashboard.datafeeds.scheduled import ScheduledDataFeed
+from doodledashboard.filters.filter import FilterResults
+from doodledashboard.message_store import MessageStore
 from doodledashboard.notifications.notification import FilteredNotification
 
 
@@ -20,6 +27,15 @@ class DashboardMerger:
         if x.display:
             accum_value.display = x.display
 
+        if x.poller:
+            accum_value.poller = x.poller
+
+        if x.background_interval is not None:
+            accum_value.background_interval = x.background_interval
+
+        if x.message_store is not None:
+            accum_value.message_store = x.message_store
+
         accum_value.add_data_feeds(x.data_feeds)
         accum_value.add_notifications(x.notifications)
 
@@ -77,22 +93,69 @@ class ComponentConfigParser:
         return None
 
 
+class DataFeedComponentsConfigParser(ComponentConfigParser):
+    """
+    Parser specific to the data-feed component type, which can declare how often it is refreshed:
+        {
+            'refresh-interval': <seconds between polling the data-feed>
+            'refresh-jitter': <up to this many seconds are randomly added to each interval>
+            'timeout': <seconds to wait for the data-feed before reusing its last messages>
+            'circuit-breaker': <true, or the options below, to stop polling the data-feed whilst it keeps failing>
+                'failure-threshold': <consecutive failures before the data-feed stops being polled>
+                'backoff': <seconds before the data-feed is polled again, doubling each time it fails>
+                'max-backoff': <most seconds between polling the failing data-feed>
+        }
+    """
+
+    def _parse_item(self, component_config, options, root_config):
+        data_feed = component_config.create(options, self._secret_store)
+
+        if root_config.get("circuit-breaker"):
+            data_feed = self._create_circuit_breaker(data_feed, root_config["circuit-breaker"])
+
+        if "refresh-interval" in root_config:
+            refresh_interval = _parse_seconds("Data-feed", root_config, "refresh-interval")
+            jitter = _parse_seconds("Data-feed", root_config, "refresh-jitter", 0)
+            data_feed = ScheduledDataFeed(data_feed, refresh_interval, jitter)
+
+        data_feed.timeout = _parse_seconds("Data-feed", root_config, "timeout")
+
+        return data_feed
+
+    @staticmethod
+    def _create_circuit_breaker(data_feed, config):
+        config = config if isinstance(config, dict) else {}
+
+        failure_threshold = config.get("failure-threshold", CircuitBreakerDataFeed.DEFAULT_FAILURE_THRESHOLD)
+        if isinstance(failure_threshold, bool) or not isinstance(failure_threshold, int) or failure_threshold < 1:
+            raise InvalidConfigurationException("Circuit-breaker option 'failure-threshold' must be a number above 0")
+
+        backoff = _parse_seconds("Circuit-breaker", config, "backoff", CircuitBreakerDataFeed.DEFAULT_BACKOFF)
+        max_backoff = _parse_seconds(
+            "Circuit-breaker", config, "max-backoff", max(backoff, CircuitBreakerDataFeed.DEFAULT_MAX_BACKOFF)
+        )
+
+        return CircuitBreakerDataFeed(data_feed, failure_threshold, backoff, max_backoff)
+
+
 class NotificationComponentsConfigParser(ComponentConfigParser):
     """
-    Parser specific to the notification component type, which contains filters
+    Parser specific to the notification component type, which contains filters. Every notification it parses shares
+    the results of identical filters.
     """
 
     def __init__(self, notification_configs, filter_parser, secret_store):
         super().__init__(notification_configs, secret_store)
         self._filter_parser = filter_parser
         self._secret_store = secret_store
+        self._filter_results = FilterResults()
 
     def _parse_item(self, component_config, options, root_config):
         notification = component_config.create(options, self._secret_store)
 
         if "filters" in root_config:
             filters = self._parse_filters(root_config["filters"])
-            return FilteredNotification(notification, filters)
+            return FilteredNotification(notification, filters, self._filter_results)
         else:
             return notification
 
@@ -100,10 +163,118 @@ class NotificationComponentsConfigParser(ComponentConfigParser):
         return [self._filter_parser.parse(section) for section in filters_config]
 
 
+class PollerConfigParser:
+    """
+    Parses the optional polling section of a dashboard, which decides how the data-feeds are polled:
+        {
+            'mode': 'sequential', 'threads' or 'asyncio'
+            'max-workers': <maximum number of threads polling data-feeds at once in threads or asyncio mode>
+            'background': <true to poll the data-feeds in the background whilst the display is drawing>
+            'background-interval': <seconds between each poll in the background>
+            'deadline': <seconds each poll may take before late data-feeds are given up on, in threads or asyncio mode>
+            'retry-after': <seconds a data-feed that hasn't responded is waited on before it's called again, in threads
+                            or asyncio mode>
+        }
+    """
+
+    _DEFAULT_MODE = "sequential"
+    _DEFAULT_BACKGROUND_INTERVAL = 5
+
+    def parse(self, config):
+        config = config or {}
+        mode = config.get("mode", self._DEFAULT_MODE)
+
+        deadline = _parse_seconds("Polling", config, "deadline", None)
+        retry_after = _parse_seconds("Polling", config, "retry-after", TimeLimitedPoller.DEFAULT_RETRY_AFTER)
+
+        if mode == "sequential":
+            for key in ["deadline", "retry-after"]:
+                if key in config:
+                    raise InvalidConfigurationException(
+                        "Polling option '%s' requires the 'threads' or 'asyncio' mode" % key
+                    )
+            return SequentialPoller()
+        elif mode == "threads":
+            return ThreadedPoller(self._parse_max_workers(config), deadline, retry_after=retry_after)
+        elif mode == "asyncio":
+            return AsyncioPoller(self._parse_max_workers(config), deadline, retry_after=retry_after)
+
+        raise InvalidConfigurationException(
+            "Polling mode '%s' is not recognised, expected 'sequential', 'threads' or 'asyncio'" % mode
+        )
+
+    @staticmethod
+    def _parse_max_workers(config):
+        max_workers = config.get("max-workers", ThreadedPoller.DEFAULT_MAX_WORKERS)
+        if isinstance(max_workers, bool) or not isinstance(max_workers, int) or max_workers < 1:
+            raise InvalidConfigurationException("Polling option 'max-workers' must be a number greater than 0")
+
+        return max_workers
+
+    def parse_background_interval(self, config):
+        """
+        :return: Seconds between polling the data-feeds in the background, or None if background polling is disabled
+        """
+        config = config or {}
+        if not config.get("background", False):
+            return None
+
+        return _parse_seconds("Polling", config, "background-interval", self._DEFAULT_BACKGROUND_INTERVAL)
+
+
+class MessageStoreConfigParser:
+    """
+    Parses the optional history section of a dashboard, which keeps the polled messages for notifications to look back
+    through:
+        {
+            'max-messages': <most messages kept in memory>
+            'max-age': <seconds a message is kept for>
+            'file': <SQLite file that messages are moved to once there are too many to keep in memory>
+            'max-file-messages': <most messages kept in the file>
+        }
+    """
+
+    def parse(self, config):
+        config = config or {}
+
+        max_messages = self._parse_count(config, "max-messages", MessageStore.DEFAULT_MAX_MESSAGES)
+        max_age = _parse_seconds("History", config, "max-age")
+        max_file_messages = self._parse_count(config, "max-file-messages", None)
+
+        path = config.get("file")
+        if path is not None:
+            if not isinstance(path, str):
+                raise InvalidConfigurationException("History option 'file' must be a path")
+            path = os.path.expanduser(path)
+
+        return MessageStore(max_messages, max_age, path, max_file_messages)
+
+    @staticmethod
+    def _parse_count(config, key, default):
+        count = config.get(key, default)
+        if count is not None and (isinstance(count, bool) or not isinstance(count, int) or count < 1):
+            raise InvalidConfigurationException("History option '%s' must be a number greater than 0" % key)
+
+        return count
+
+
+def _parse_seconds(section_name, config, key, default=None):
+    if key not in config:
+        return default
+
+    seconds = config[key]
+    if isinstance(seconds, bool) or not isinstance(seconds, (int, float)) or seconds < 0:
+        raise InvalidConfigurationException("%s option '%s' must be a number of seconds" % (section_name, key))
+
+    return seconds
+
+
 class DashboardConfigReader:
 
     def __init__(self, component_configs_loader, secrets):
         self._dashboard_merger = DashboardMerger()
+        self._poller_config_parser = PollerConfigParser()
+        self._message_store_config_parser = MessageStoreConfigParser()
         self._component_configs_loader = component_configs_loader
         self._secret_store = secrets
 
@@ -114,7 +285,7 @@ class DashboardConfigReader:
         self._display_config_section_parser = ComponentConfigParser(display_configs,  self._secret_store)
 
         data_feed_configs = self._component_configs_loader.load_by_type(ComponentType.DATA_FEED)
-        self._data_feed_config_section_parser = ComponentConfigParser(data_feed_configs, self._secret_store)
+        self._data_feed_config_section_parser = DataFeedComponentsConfigParser(data_feed_configs, self._secret_store)
 
         filter_configs = self._component_configs_loader.load_by_type(ComponentType.FILTER)
         filter_parser = ComponentConfigParser(filter_configs,  self._secret_store)
@@ -162,7 +333,17 @@ class DashboardConfigReader:
             self._notification_config_section_parser.parse(section) for section in config.get("notifications", [])
         ]
 
-        return Dashboard(display, data_feeds, notifications)
+        poller = None
+        background_interval = None
+        if "polling" in config:
+            poller = self._poller_config_parser.parse(config["polling"])
+            background_interval = self._poller_config_parser.parse_background_interval(config["polling"])
+
+        message_store = None
+        if "history" in config:
+            message_store = self._message_store_config_parser.parse(config["history"])
+
+        return Dashboard(display, data_feeds, notifications, poller, background_interval, message_store)
 
 
 class InvalidConfigurationException(Exception):
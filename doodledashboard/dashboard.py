@@ -1,11 +1,19 @@
 import logging
+import threading
+
+from doodledashboard.datafeeds.datafeed import MessageBatch, fingerprint_messages
+from doodledashboard.datafeeds.poller import SequentialPoller, ThreadedPoller
 
 
 class Dashboard:
-    def __init__(self, display=None, data_feeds=None, notifications=None):
+    def __init__(self, display=None, data_feeds=None, notifications=None, poller=None, background_interval=None,
+                 message_store=None):
         self._display = display
         self._data_feeds = data_feeds or []
         self._notifications = notifications or []
+        self._poller = poller
+        self._background_interval = background_interval
+        self._message_store = message_store
 
     @property
     def display(self):
@@ -29,45 +37,204 @@ class Dashboard:
     def add_notifications(self, notifications):
         self._notifications += notifications
 
+    @property
+    def poller(self):
+        return self._poller
+
+    @poller.setter
+    def poller(self, poller):
+        self._poller = poller
+
+    @property
+    def background_interval(self):
+        """
+        :return: Seconds between polling the data-feeds in the background, or None if they're polled between drawing
+        """
+        return self._background_interval
+
+    @background_interval.setter
+    def background_interval(self, background_interval):
+        self._background_interval = background_interval
+
+    @property
+    def message_store(self):
+        """
+        :return: MessageStore the polled messages are kept in, or None if they're only kept until the next poll
+        """
+        return self._message_store
+
+    @message_store.setter
+    def message_store(self, message_store):
+        self._message_store = message_store
+
 
 class DashboardRunner:
 
     def __init__(self, dashboard):
         self._logger = logging.getLogger(__name__)
         self._dashboard = dashboard
+        self._poller = dashboard.poller or self._default_poller(dashboard)
+        self._messages_fingerprint = None
+        self._last_drawn_output = None
+
+        if dashboard.message_store is not None:
+            for notification in dashboard.notifications:
+                notification.message_store = dashboard.message_store
+
+    @staticmethod
+    def _default_poller(dashboard):
+        if any(feed.timeout is not None for feed in dashboard.data_feeds):
+            return ThreadedPoller()
+
+        return SequentialPoller()
 
     def cycle(self):
         """
         Cycles through notifications with latest results from data feeds.
         """
         messages = self.poll_datafeeds()
-        notifications = self.process_notifications(messages)
+        notifications = self.process_notifications(messages, self.messages_changed(messages))
 
         self.draw_notifications(notifications)
 
     def poll_datafeeds(self):
-        messages = []
-        for feed in self._dashboard.data_feeds:
-            messages += feed.get_messages()
+        messages = MessageBatch(self._poller.poll(self._dashboard.data_feeds))
+
+        if self._dashboard.message_store is not None:
+            self._dashboard.message_store.add(messages)
 
         return messages
 
-    def process_notifications(self, messages):
+    def messages_changed(self, messages):
+        """
+        :return: True unless the messages are identical to those polled last time
+        """
+        fingerprint = fingerprint_messages(messages)
+        changed = fingerprint != self._messages_fingerprint
+        self._messages_fingerprint = fingerprint
+
+        return changed
+
+    def process_notifications(self, messages, messages_changed=True):
         for notification in self._dashboard.notifications:
-            yield notification.create(messages)
+            yield notification.create(messages, messages_changed)
 
     def draw_notifications(self, notification_outputs):
-        display = self._dashboard.display
-
         for notification_output in notification_outputs:
-            if notification_output is not None:
-                display.draw(notification_output)
+            self._draw(notification_output)
+
+    def _draw(self, notification_output):
+        if notification_output is None:
+            return
+
+        if notification_output is self._last_drawn_output:
+            self._dashboard.display.draw_unchanged(notification_output)
+        else:
+            self._dashboard.display.draw(notification_output)
+
+        self._last_drawn_output = notification_output
+
+
+class BackgroundDashboardRunner(DashboardRunner):
+    """
+    Polls the data-feeds and creates the notifications' outputs in a background thread whilst the display is drawing,
+    so the display isn't kept waiting on the data-feeds.
+
+    Outputs are only replaced once the display has drawn every one of them, so an output made from messages that only
+    appear in one poll, such as Slack's, is always drawn. Until then the data-feeds aren't polled again, leaving new
+    messages with the data-feeds.
+    """
+
+    def __init__(self, dashboard, interval):
+        """
+        :param dashboard: Dashboard to run
+        :param interval: Seconds to wait between each time the data-feeds are polled, and most seconds a cycle waits
+        for the first outputs
+        """
+        super().__init__(dashboard)
+        self._interval = interval
+        self._outputs = None
+        self._undrawn = set()
+        self._outputs_available = threading.Condition()
+        self._stopped = threading.Event()
+        self._producer = None
+
+    def start(self):
+        if not self._producer:
+            self._producer = threading.Thread(target=self._produce, name="dashboard-producer", daemon=True)
+            self._producer.start()
+
+    def stop(self):
+        self._stopped.set()
+        with self._outputs_available:
+            self._outputs_available.notify_all()
+
+        if self._producer:
+            self._producer.join()
+
+    def cycle(self):
+        """
+        Draws the latest output of each notification in turn, starting the background polling if necessary. If no
+        outputs have been created yet, such as whilst every poll is failing, the cycle ends without drawing once the
+        interval has passed.
+        """
+        self.start()
+        self._wait_for_outputs()
+
+        for index in range(len(self._dashboard.notifications)):
+            self._draw(self._take_output(index))
+
+    def latest_output(self, index):
+        with self._outputs_available:
+            return self._output_at(index)
+
+    def _take_output(self, index):
+        with self._outputs_available:
+            self._undrawn.discard(index)
+            if not self._undrawn:
+                self._outputs_available.notify_all()
+
+            return self._output_at(index)
+
+    def _output_at(self, index):
+        if self._outputs is None or index >= len(self._outputs):
+            return None
+
+        return self._outputs[index]
+
+    def _wait_for_outputs(self):
+        with self._outputs_available:
+            self._outputs_available.wait_for(
+                lambda: self._outputs is not None or self._stopped.is_set(), self._interval
+            )
+
+    def _wait_until_drawn(self):
+        with self._outputs_available:
+            self._outputs_available.wait_for(lambda: not self._undrawn or self._stopped.is_set())
+
+    def _produce(self):
+        while not self._stopped.is_set():
+            try:
+                messages = self.poll_datafeeds()
+                self._publish(list(self.process_notifications(messages, self.messages_changed(messages))))
+            except Exception:
+                self._logger.exception("Failed to update notifications in the background")
+
+            self._wait_until_drawn()
+            self._stopped.wait(self._interval)
+
+    def _publish(self, notification_outputs):
+        with self._outputs_available:
+            self._outputs = notification_outputs
+            self._undrawn = set(range(len(notification_outputs)))
+            self._outputs_available.notify_all()
 
 
 class DashboardValidator:
 
     def validate(self, dashboard):
         self._check_display_supports_notification(dashboard)
+        self._check_poller_supports_timeouts(dashboard)
 
     @staticmethod
     def _check_display_supports_notification(dashboard: Dashboard):
@@ -79,6 +246,15 @@ class DashboardValidator:
                 if output_type not in supported_notifications:
                     raise DisplayDoesNotSupportNotification(dashboard.display, notification, output_type)
 
+    @staticmethod
+    def _check_poller_supports_timeouts(dashboard: Dashboard):
+        if not dashboard.poller or dashboard.poller.supports_timeouts:
+            return
+
+        for data_feed in dashboard.data_feeds:
+            if data_feed.timeout is not None:
+                raise PollerDoesNotSupportTimeouts(dashboard.poller, data_feed)
+
 
 class ValidationException(Exception):
     def __init__(self, message):
@@ -106,3 +282,18 @@ class DisplayDoesNotSupportNotification(ValidationException):
     @property
     def output_type_not_supported(self):
         return self._output_type_not_supported
+
+
+class PollerDoesNotSupportTimeouts(ValidationException):
+    def __init__(self, poller, data_feed):
+        super().__init__("Data-feed '%s' has a timeout, which '%s' cannot enforce" % (data_feed, poller))
+        self._poller = poller
+        self._data_feed = data_feed
+
+    @property
+    def poller(self):
+        return self._poller
+
+    @property
+    def data_feed(self):
+        return self._data_feed
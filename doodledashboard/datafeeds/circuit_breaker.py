@@ -0,0 +1,135 @@
+import logging
+import time
+
+from doodledashboard.datafeeds.datafeed import DataFeedDecorator
+
+
+class CircuitBreakerDataFeed(DataFeedDecorator):
+    """
+    Stops polling a data-feed that keeps failing. After a number of consecutive failures the circuit opens and the
+    data-feed's last messages are served instead, until a probe is made once a back-off has passed. Each failed probe
+    doubles the back-off, up to a maximum, and a successful probe closes the circuit again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    DEFAULT_FAILURE_THRESHOLD = 3
+    DEFAULT_BACKOFF = 30
+    DEFAULT_MAX_BACKOFF = 600
+
+    def __init__(self, data_feed, failure_threshold=DEFAULT_FAILURE_THRESHOLD, backoff=DEFAULT_BACKOFF,
+                 max_backoff=DEFAULT_MAX_BACKOFF, clock=time.monotonic):
+        """
+        :param data_feed: Data-feed to protect
+        :param failure_threshold: Consecutive failures that open the circuit
+        :param backoff: Seconds to wait before the first probe of an open circuit
+        :param max_backoff: Most seconds to wait between probes
+        """
+        super().__init__(data_feed)
+        self._logger = logging.getLogger(__name__)
+        self._failure_threshold = failure_threshold
+        self._initial_backoff = backoff
+        self._max_backoff = max_backoff
+        self._clock = clock
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._backoff = backoff
+        self._retry_at = None
+        self._messages = []
+
+    def get_latest_messages(self):
+        if not self._allow_request():
+            return self._cached_messages()
+
+        try:
+            messages = self._data_feed.get_latest_messages()
+        except Exception as err:
+            self._failed(err)
+            return self._cached_messages()
+
+        return self._succeeded(messages)
+
+    async def fetch_latest_messages(self):
+        if not self._allow_request():
+            return self._cached_messages()
+
+        try:
+            messages = await self._data_feed.fetch_latest_messages()
+        except Exception as err:
+            self._failed(err)
+            return self._cached_messages()
+
+        return self._succeeded(messages)
+
+    def _allow_request(self):
+        if self._state == self.OPEN:
+            if self._clock() < self._retry_at:
+                return False
+
+            self._logger.info("Probing data-feed '%s' to see if it has recovered", str(self._data_feed))
+            self._state = self.HALF_OPEN
+
+        return True
+
+    def _succeeded(self, messages):
+        if self._state != self.CLOSED:
+            self._logger.info("Data-feed '%s' has recovered, closing its circuit", str(self._data_feed))
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._backoff = self._initial_backoff
+        self._retry_at = None
+        self._messages = messages
+
+        return messages
+
+    def _failed(self, err):
+        self._failures += 1
+        self._logger.info("Data-feed '%s' failed (%s in a row): %s", str(self._data_feed), self._failures, err)
+
+        if self._state == self.HALF_OPEN:
+            self._backoff = min(self._backoff * 2, self._max_backoff)
+            self._open()
+        elif self._failures >= self._failure_threshold:
+            self._open()
+
+    def _open(self):
+        self._state = self.OPEN
+        self._retry_at = self._clock() + self._backoff
+        self._logger.warning(
+            "Circuit for data-feed '%s' is open, its last messages will be used for the next %ss",
+            str(self._data_feed), self._backoff
+        )
+
+    def _cached_messages(self):
+        return [message.as_stale() for message in self._messages]
+
+    @property
+    def state(self):
+        return self._state
+
+    @property
+    def failures(self):
+        return self._failures
+
+    @property
+    def seconds_until_retry(self):
+        if self._state != self.OPEN:
+            return 0
+
+        return max(0, self._retry_at - self._clock())
+
+    @property
+    def failure_threshold(self):
+        return self._failure_threshold
+
+    @property
+    def backoff(self):
+        return self._backoff
+
+    @property
+    def max_backoff(self):
+        return self._max_backoff
@@ -1,63 +1,288 @@
+import asyncio
 import json
-from abc import abstractmethod
+import logging
+import warnings
+from types import MappingProxyType
 
 from doodledashboard.component import NamedComponent
 
 
 class Message:
     """
-    Represents a textual entity from a data feed.
+    Represents an entity from a data feed, such as a tweet or weather report. Messages can't be changed once created,
+    so are shared between data-feeds, notifications and caches without being copied.
     """
 
-    # @todo Update Messages to use dictionaries instead of text
-    def __init__(self, text, source_name=''):
+    __slots__ = ("_text", "_source_name", "_stale", "_timestamp", "_id", "_payload", "_fingerprint")
+
+    def __init__(self, text, source_name='', stale=False, timestamp=None, message_id=None, payload=None):
         """
         :param text: Entity's text
         :param source_name: Name of the message source
+        :param stale: True if the message is being repeated because its source couldn't provide new messages in time
+        :param timestamp: Seconds since the epoch when the entity was created or last updated, if known
+        :param message_id: ID given to the entity by its source, if it has one
+        :param payload: dict of the entity's fields, so they can be read without parsing the text. The message keeps a
+        read-only copy.
         """
+        object.__setattr__(self, "_text", text)
+        object.__setattr__(self, "_source_name", source_name)
+        object.__setattr__(self, "_stale", stale)
+        object.__setattr__(self, "_timestamp", timestamp)
+        object.__setattr__(self, "_id", message_id)
+        object.__setattr__(self, "_payload", MappingProxyType(dict(payload or {})))
+        object.__setattr__(self, "_fingerprint", None)
+
+    def __setattr__(self, name, value):
+        if name == "source_name":
+            self._set_source_name(value)
+            return
 
-        self._text = text
-        self._source_name = source_name
+        raise AttributeError("Messages can't be changed, use with_source_name() or as_stale() to create a copy")
 
     @property
     def source_name(self):
         return self._source_name
 
-    @source_name.setter
-    def source_name(self, source_name):
-        self._source_name = source_name
+    def _set_source_name(self, source_name):
+        warnings.warn(
+            "Setting Message.source_name is deprecated, use with_source_name() to create a copy", DeprecationWarning,
+            stacklevel=3
+        )
+        object.__setattr__(self, "_source_name", source_name)
+        object.__setattr__(self, "_fingerprint", None)
 
     @property
     def text(self):
         return self._text
 
+    @property
+    def stale(self):
+        return self._stale
+
+    @property
+    def timestamp(self):
+        return self._timestamp
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def payload(self):
+        """
+        :return: Read-only mapping of the entity's fields
+        """
+        return self._payload
+
+    @property
+    def fingerprint(self):
+        """
+        :return: A tuple of the message's fields, with its payload as JSON, which is equal for identical messages.
+        Whether the message is stale is left out, so a message repeated whilst its source is unavailable is the same.
+        """
+        if self._fingerprint is None:
+            fingerprint = (
+                self._text, self._source_name, self._timestamp, self._id,
+                json.dumps(dict(self._payload), sort_keys=True, default=str)
+            )
+            object.__setattr__(self, "_fingerprint", fingerprint)
+
+        return self._fingerprint
+
+    def get(self, field, default=None):
+        """
+        :return: The value of a field in the message's payload
+        """
+        return self._payload.get(field, default)
+
+    def with_source_name(self, source_name):
+        if source_name == self._source_name:
+            return self
+
+        return Message(self._text, source_name, self._stale, self._timestamp, self._id, self._payload)
+
+    def as_stale(self):
+        stale = Message(self._text, self._source_name, True, self._timestamp, self._id, self._payload)
+        object.__setattr__(stale, "_fingerprint", self._fingerprint)
+        return stale
+
+
+def fingerprint_messages(messages):
+    """
+    :return: A tuple of the messages' fingerprints, in order, which is equal for identical batches of messages
+    """
+    return tuple(message.fingerprint for message in messages)
+
+
+class MessageBatch(list):
+    """
+    The messages polled in a cycle, indexed by the name of the data-feed they came from so the messages from a data-feed
+    can be looked up rather than found by checking every message. The index is built the first time it's needed, so
+    the batch shouldn't be changed once it has been given to notifications.
+    """
+
+    _messages_by_source = None
+
+    def from_source(self, source_name):
+        """
+        :return: The messages from the data-feed, in order
+        """
+        if self._messages_by_source is None:
+            messages_by_source = {}
+            for message in self:
+                messages_by_source.setdefault(message.source_name, []).append(message)
+
+            self._messages_by_source = messages_by_source
+
+        return self._messages_by_source.get(source_name, [])
+
+
+def messages_from_source(messages, source_name):
+    """
+    :return: The messages from the data-feed, looked up if the messages are a MessageBatch
+    """
+    if isinstance(messages, MessageBatch):
+        return messages.from_source(source_name)
+
+    return [message for message in messages if message.source_name == source_name]
+
 
 class MessageJsonEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, Message):
-            return {
+            message = {
                 "text": obj.text,
-                "source": str(obj.source_name)
+                "source": str(obj.source_name),
+                "stale": obj.stale
             }
 
+            if obj.timestamp is not None:
+                message["timestamp"] = obj.timestamp
+            if obj.id is not None:
+                message["id"] = obj.id
+            if obj.payload:
+                message["payload"] = dict(obj.payload)
+
+            return message
+
         return json.JSONEncoder.default(self, obj)
 
 
 class DataFeed(NamedComponent):
+    """
+    A source of messages for the dashboard. Data-feeds implement either get_latest_messages(), or
+    fetch_latest_messages() if they can fetch their messages without blocking.
+    """
+
+    _timeout = None
 
     def __init__(self):
         super().__init__()
 
-    @abstractmethod
+    @property
+    def timeout(self):
+        """
+        :return: Seconds the dashboard waits for the data-feed's messages before using its last messages, or None to
+        wait indefinitely
+        """
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, timeout):
+        self._timeout = timeout
+
     def get_latest_messages(self):
         """
         Called by the dashboard when it is ready to process new messages.
         :return: An array of the latest messages from the datafeed
         """
+        if type(self).fetch_latest_messages is DataFeed.fetch_latest_messages:
+            raise NotImplementedError("%s must implement get_latest_messages or fetch_latest_messages" % type(self))
+
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.fetch_latest_messages())
+        finally:
+            loop.close()
+
+    async def fetch_latest_messages(self):
+        """
+        Called by a dashboard polling its data-feeds from an event loop when it is ready to process new messages.
+        Unless overridden, get_latest_messages() is run in the event loop's executor.
+        :return: An array of the latest messages from the datafeed
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.get_latest_messages)
 
     def get_messages(self):
-        messages = self.get_latest_messages()
-        for message in messages:
-            message.source_name = self.name
+        try:
+            return self._set_source(self.get_latest_messages())
+        except DataFeedUnavailable as err:
+            return self._unavailable(err)
+
+    async def fetch_messages(self):
+        try:
+            return self._set_source(await self.fetch_latest_messages())
+        except DataFeedUnavailable as err:
+            return self._unavailable(err)
+
+    def _unavailable(self, err):
+        logging.getLogger(__name__).info("Data-feed '%s' is unavailable: %s", str(self), err.message)
+        return []
+
+    def _set_source(self, messages):
+        return [message.with_source_name(self.name) for message in messages]
+
+
+class DataFeedUnavailable(Exception):
+    """
+    Raised by a data-feed when it cannot get its latest messages, such as when the service it polls is down
+    """
+
+    def __init__(self, message):
+        self._message = message
+
+    def __str__(self):
+        return repr(self._message)
+
+    @property
+    def message(self):
+        return self._message
+
+
+class DataFeedDecorator(DataFeed):
+    """
+    Wraps a data-feed to change how it is polled, whilst appearing to the dashboard as the data-feed itself
+    """
+
+    def __init__(self, data_feed):
+        super().__init__()
+        self._data_feed = data_feed
 
-        return messages
+    @property
+    def data_feed(self):
+        return self._data_feed
+
+    @DataFeed.name.setter
+    def name(self, name):
+        self._name = name
+        self._data_feed.name = name
+
+    def get_latest_messages(self):
+        return self._data_feed.get_latest_messages()
+
+    async def fetch_latest_messages(self):
+        return await self._data_feed.fetch_latest_messages()
+
+    def __str__(self):
+        return str(self._data_feed)
+
+
+def iter_data_feed_layers(data_feed):
+    """
+    :return: The data-feed followed by each data-feed it wraps
+    """
+    while data_feed is not None:
+        yield data_feed
+        data_feed = data_feed.data_feed if isinstance(data_feed, DataFeedDecorator) else None
@@ -1,6 +1,11 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 import pyowm
 
-from doodledashboard.component import MissingRequiredOptionException, DataFeedCreator
+from doodledashboard.component import MissingRequiredOptionException, InvalidOptionException, DataFeedCreator
 from doodledashboard.datafeeds.datafeed import DataFeed, Message
 from doodledashboard.secrets_store import SecretNotFound
 
@@ -14,10 +19,11 @@ class GeoLocationOption:
     def _exists_and_is_numeric(option, key):
         if key not in option:
             raise MissingRequiredOptionException("Expected '%s' option to exist as part of location option" % key)
-        elif not option[key].isnumeric():
-            raise MissingRequiredOptionException("Expected '%s' option isn't numeric" % key)
 
-        return option[key]
+        try:
+            return float(option[key])
+        except (TypeError, ValueError):
+            raise MissingRequiredOptionException("Expected '%s' option isn't numeric" % key)
 
     @staticmethod
     def parse_option(position_option):
@@ -35,11 +41,85 @@ class GeoLocationOption:
         return self._longitude
 
 
+class ObservationCache:
+    """
+    Shares weather observations between the OpenWeather feeds showing the same location, so each location is only
+    requested from OpenWeather once per time-to-live
+    """
+
+    DEFAULT_TTL = 600
+
+    def __init__(self, ttl=DEFAULT_TTL, clock=time.monotonic):
+        """
+        :param ttl: Seconds an observation is shared for before it is requested again
+        """
+        self._ttl = ttl
+        self._clock = clock
+        self._observations = {}
+        self._location_locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, location, request_observation, ttl=None):
+        """
+        :param location: Key identifying the location, as made by location_key()
+        :param request_observation: Requests the location's observation from OpenWeather if it isn't cached
+        :param ttl: Seconds to share a newly requested observation for, or None for the cache's time-to-live
+        :return: The location's observation
+        """
+        with self._lock:
+            location_lock = self._location_locks.setdefault(location, threading.Lock())
+
+        with location_lock:
+            observation = self.peek(location)
+            if observation is None:
+                observation = request_observation()
+                self.put(location, observation, ttl)
+
+            return observation
+
+    def peek(self, location):
+        """
+        :return: The location's observation, or None if it isn't cached or has expired
+        """
+        expires_at, observation = self._observations.get(location, (None, None))
+        if expires_at is None or self._clock() >= expires_at:
+            return None
+
+        return observation
+
+    def put(self, location, observation, ttl=None):
+        self._observations[location] = (self._clock() + (self._ttl if ttl is None else ttl), observation)
+
+    @staticmethod
+    def location_key(place_name=None, position=None, city_id=None, api_key=None):
+        """
+        :param api_key: OpenWeather API key the location is requested with, as feeds with different keys don't share
+        :return: The same key for equivalent locations, such as 'London, GB' and 'london,gb'
+        """
+        if city_id is not None:
+            return api_key, "id", int(city_id)
+
+        if position:
+            return api_key, "coords", round(position.latitude, 4), round(position.longitude, 4)
+
+        return api_key, "place", ",".join(part.strip() for part in place_name.lower().split(","))
+
+
+_shared_observation_cache = ObservationCache()
+
+
 class OpenWeatherFeed(DataFeed):
 
-    def __init__(self, place_name, position, client):
+    def __init__(self, place_name, position, client, observation_cache=None, api_key=None, observation_ttl=None):
+        """
+        :param api_key: OpenWeather API key the client uses, so observations are only shared with feeds using it
+        :param observation_ttl: Seconds an observation is shared for, or None for the observation cache's default
+        """
         DataFeed.__init__(self)
         self._client = client
+        self._observation_cache = observation_cache or _shared_observation_cache
+        self._api_key = api_key
+        self._observation_ttl = observation_ttl
 
         self._place_name = place_name
         self._has_place_name = True if place_name else False
@@ -51,24 +131,190 @@ class OpenWeatherFeed(DataFeed):
             raise Exception("Place name or position has to be defined")
 
     def get_latest_messages(self):
-        if self._has_position:
-            observation = self._client.weather_at_coords(self._position.latitude, self._position.longitude)
-        else:
-            observation = self._client.weather_at_place(self._place_name)
+        location = ObservationCache.location_key(self._place_name, self._position, api_key=self._api_key)
+        observation = self._observation_cache.get(location, self._request_observation, self._observation_ttl)
 
-        weather = observation.get_weather()
+        fields = _weather_fields(observation.get_weather())
+        return [Message(_describe_weather(fields), payload=fields)]
 
-        detailed_status = weather.get_detailed_status()
-        status = weather.get_status()
-        temperature = weather.get_temperature(unit='celsius')
-        message = "%s;%s;%s" % (detailed_status, status, temperature)
+    def _request_observation(self):
+        if self._has_position:
+            return self._client.weather_at_coords(self._position.latitude, self._position.longitude)
 
-        return [Message(message)]
+        return self._client.weather_at_place(self._place_name)
 
     def __str__(self):
         return "OpenWeather"
 
 
+class WeatherLocation:
+    """
+    A location shown by an OpenWeatherLocationsFeed, given by its place name, coordinates or OpenWeather city ID
+    """
+
+    def __init__(self, place_name=None, position=None, city_id=None):
+        if not place_name and not position and city_id is None:
+            raise Exception("Place name, position or city ID has to be defined")
+
+        self._place_name = place_name
+        self._position = position
+        self._city_id = city_id
+
+    @staticmethod
+    def parse_option(location_option):
+        if "city-id" in location_option:
+            city_id = location_option["city-id"]
+            if isinstance(city_id, bool) or not isinstance(city_id, int):
+                raise InvalidOptionException("Expected 'city-id' option to be a number")
+
+            return WeatherLocation(city_id=city_id)
+
+        if "coords" in location_option:
+            return WeatherLocation(position=GeoLocationOption.parse_option(location_option["coords"]))
+
+        if "place-name" in location_option:
+            return WeatherLocation(place_name=location_option["place-name"])
+
+        raise MissingRequiredOptionException("Expected each location to have a 'place-name', 'coords' or 'city-id'")
+
+    def key(self, api_key=None):
+        return ObservationCache.location_key(self._place_name, self._position, self._city_id, api_key)
+
+    @property
+    def place_name(self):
+        return self._place_name
+
+    @property
+    def position(self):
+        return self._position
+
+    @property
+    def city_id(self):
+        return self._city_id
+
+    def name(self, observation):
+        if self._place_name:
+            return self._place_name
+
+        return observation.get_location().get_name()
+
+
+class OpenWeatherLocationsFeed(DataFeed):
+    """
+    Shows the weather at several locations, with a message for each starting with the location's name. Locations given
+    by OpenWeather city ID are requested together, up to 20 per request, and the others are requested at the same time
+    as each other.
+    """
+
+    _MAX_WORKERS = 8
+    _MAX_IDS_PER_REQUEST = 20
+
+    def __init__(self, locations, client, observation_cache=None, api_key=None, observation_ttl=None):
+        """
+        :param api_key: OpenWeather API key the client uses, so observations are only shared with feeds using it
+        :param observation_ttl: Seconds an observation is shared for, or None for the observation cache's default
+        """
+        DataFeed.__init__(self)
+        self._locations = locations
+        self._client = client
+        self._observation_cache = observation_cache or _shared_observation_cache
+        self._api_key = api_key
+        self._observation_ttl = observation_ttl
+        self._executor = None
+
+    def get_latest_messages(self):
+        observations = self._request_city_observations()
+
+        other_locations = [location for location in self._locations if location.city_id is None]
+        for location, observation in zip(other_locations, self._map(self._observe, other_locations)):
+            observations[location.key(self._api_key)] = observation
+
+        messages = []
+        for location in self._locations:
+            observation = observations.get(location.key(self._api_key))
+            if observation:
+                name = location.name(observation)
+                fields = _weather_fields(observation.get_weather())
+                fields["location"] = name
+
+                messages.append(Message("%s;%s" % (name, _describe_weather(fields)), payload=fields))
+
+        return messages
+
+    def _request_city_observations(self):
+        observations = {}
+        missing_city_ids = []
+
+        for location in self._locations:
+            if location.city_id is None:
+                continue
+
+            observation = self._observation_cache.peek(location.key(self._api_key))
+            if observation is None:
+                missing_city_ids.append(location.city_id)
+            else:
+                observations[location.key(self._api_key)] = observation
+
+        for start in range(0, len(missing_city_ids), self._MAX_IDS_PER_REQUEST):
+            city_ids = missing_city_ids[start:start + self._MAX_IDS_PER_REQUEST]
+            for observation in self._client.weather_at_ids(city_ids):
+                location = ObservationCache.location_key(
+                    city_id=observation.get_location().get_ID(), api_key=self._api_key
+                )
+                self._observation_cache.put(location, observation, self._observation_ttl)
+                observations[location] = observation
+
+        return observations
+
+    def _observe(self, location):
+        return self._observation_cache.get(
+            location.key(self._api_key), partial(self._request_observation, location), self._observation_ttl
+        )
+
+    def _request_observation(self, location):
+        if location.position:
+            return self._client.weather_at_coords(location.position.latitude, location.position.longitude)
+
+        return self._client.weather_at_place(location.place_name)
+
+    def _map(self, function, locations):
+        if len(locations) < 2:
+            return [function(location) for location in locations]
+
+        if not self._executor:
+            self._executor = ThreadPoolExecutor(max_workers=self._MAX_WORKERS)
+
+        return list(self._executor.map(function, locations))
+
+    @property
+    def locations(self):
+        return self._locations
+
+    def __str__(self):
+        return "OpenWeather for %s locations" % len(self._locations)
+
+
+def _weather_fields(weather):
+    return {
+        "detailed-status": weather.get_detailed_status(),
+        "status": weather.get_status(),
+        "temperature": weather.get_temperature(unit='celsius')
+    }
+
+
+def _describe_weather(fields):
+    return "%s;%s;%s" % (fields["detailed-status"], fields["status"], fields["temperature"])
+
+
+def _parse_observation_ttl(options):
+    observation_ttl = options.get("observation-ttl")
+    if observation_ttl is not None and (isinstance(observation_ttl, bool)
+                                        or not isinstance(observation_ttl, (int, float)) or observation_ttl < 0):
+        raise InvalidOptionException("Expected 'observation-ttl' option to be a number of seconds")
+
+    return observation_ttl
+
+
 class OpenWeatherCreator(DataFeedCreator):
     _SECRET_TOKEN_ID = "open-weather-map-key"
 
@@ -78,13 +324,38 @@ class OpenWeatherCreator(DataFeedCreator):
 
     def create(self, options, secret_store):
         place_name = options["place-name"] if "place-name" in options else None
-        coords = options["coords"] if "coords" in options else None
+        coords = GeoLocationOption.parse_option(options["coords"]) if "coords" in options else None
 
         if not place_name and not coords:
             raise MissingRequiredOptionException("Expected 'place-name' or 'coords' option to exist")
 
+        observation_ttl = _parse_observation_ttl(options)
+
+        owm_token = secret_store.get(self._SECRET_TOKEN_ID)
+        if not owm_token:
+            raise SecretNotFound(self, self._SECRET_TOKEN_ID)
+
+        return OpenWeatherFeed(place_name, coords, pyowm.OWM(owm_token), api_key=owm_token,
+                               observation_ttl=observation_ttl)
+
+
+class OpenWeatherLocationsCreator(DataFeedCreator):
+    _SECRET_TOKEN_ID = "open-weather-map-key"
+
+    @staticmethod
+    def get_id():
+        return "open-weather-locations"
+
+    def create(self, options, secret_store):
+        if not options.get("locations"):
+            raise MissingRequiredOptionException("Expected 'locations' option to exist")
+
+        locations = [WeatherLocation.parse_option(location) for location in options["locations"]]
+        observation_ttl = _parse_observation_ttl(options)
+
         owm_token = secret_store.get(self._SECRET_TOKEN_ID)
         if not owm_token:
             raise SecretNotFound(self, self._SECRET_TOKEN_ID)
 
-        return OpenWeatherFeed(place_name, coords, pyowm.OWM(owm_token))
+        return OpenWeatherLocationsFeed(locations, pyowm.OWM(owm_token), api_key=owm_token,
+                                        observation_ttl=observation_ttl)
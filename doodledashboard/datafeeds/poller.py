@@ -0,0 +1,230 @@
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+
+class DataFeedPoller(ABC):
+    """
+    Collects the latest messages from a dashboard's data-feeds
+    """
+
+    @abstractmethod
+    def poll(self, data_feeds):
+        """
+        :param data_feeds: Data-feeds to poll
+        :return: Messages from every data-feed, in the same order as the data-feeds were declared
+        """
+
+    @property
+    def supports_timeouts(self):
+        """
+        :return: True if the poller can stop waiting for data-feeds that exceed their timeout
+        """
+        return False
+
+
+class SequentialPoller(DataFeedPoller):
+    """
+    Polls each data-feed one after the other
+    """
+
+    def poll(self, data_feeds):
+        messages = []
+        for feed in data_feeds:
+            messages += feed.get_messages()
+
+        return messages
+
+    def __str__(self):
+        return "Sequential poller"
+
+
+class TimeLimitedPoller(DataFeedPoller):
+    """
+    Polls data-feeds away from the calling thread so it can stop waiting for those that exceed their own timeout or the
+    deadline of the whole poll. A data-feed that runs out of time contributes its last messages, marked as stale, and
+    is waited on again during the next poll instead of being called a second time. Once it has been waited on for
+    longer than retry_after it is assumed to have hung, so it is called again.
+    """
+
+    DEFAULT_RETRY_AFTER = 300
+
+    def __init__(self, deadline=None, clock=time.monotonic, retry_after=DEFAULT_RETRY_AFTER):
+        """
+        :param deadline: Seconds each poll may take before late data-feeds are given up on, or None to wait for them
+        :param retry_after: Seconds a data-feed that hasn't responded is waited on before it is called again
+        """
+        self._logger = logging.getLogger(__name__)
+        self._deadline = deadline
+        self._clock = clock
+        self._retry_after = retry_after
+        self._pending = {}
+        self._last_messages = {}
+
+    def _seconds_left(self, feed, poll_started):
+        expiries = []
+        if feed.timeout is not None:
+            expiries.append(poll_started + feed.timeout)
+        if self._deadline is not None:
+            expiries.append(poll_started + self._deadline)
+
+        return max(0, min(expiries) - self._clock()) if expiries else None
+
+    def _completed(self, feed, messages):
+        self._pending.pop(feed, None)
+        self._last_messages[feed] = messages
+        return messages
+
+    def _timed_out(self, feed, pending, poll_started):
+        self._logger.warning("Data-feed '%s' didn't respond in time, so its last messages are being reused", str(feed))
+        if feed not in self._pending:
+            self._pending[feed] = (pending, poll_started)
+
+        return [message.as_stale() for message in self._last_messages.get(feed, [])]
+
+    def _failed(self, feed):
+        self._pending.pop(feed, None)
+
+    def _pending_call(self, feed):
+        """
+        :return: The data-feed's call that is still running from an earlier poll, or None if there isn't one or it has
+        been running too long to keep waiting on
+        """
+        if feed not in self._pending:
+            return None
+
+        pending, started = self._pending[feed]
+        if self._clock() - started < self._retry_after:
+            return pending
+
+        self._logger.warning("Data-feed '%s' hasn't responded for %ss, so it's being called again", str(feed),
+                             self._retry_after)
+        pending.cancel()
+        del self._pending[feed]
+
+        return None
+
+    @property
+    def deadline(self):
+        return self._deadline
+
+    @property
+    def retry_after(self):
+        return self._retry_after
+
+    @property
+    def supports_timeouts(self):
+        return True
+
+
+class ThreadedPoller(TimeLimitedPoller):
+    """
+    Polls all data-feeds at the same time from a pool of threads, so polling takes as long as the slowest data-feed
+    instead of the sum of them all
+    """
+
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, deadline=None, clock=time.monotonic,
+                 retry_after=TimeLimitedPoller.DEFAULT_RETRY_AFTER):
+        super().__init__(deadline, clock, retry_after)
+        self._max_workers = max_workers
+        self._executor = None
+
+    def poll(self, data_feeds):
+        if not data_feeds:
+            return []
+
+        poll_started = self._clock()
+        futures = [self._submit(feed) for feed in data_feeds]
+
+        messages = []
+        for feed, future in zip(data_feeds, futures):
+            messages += self._wait_for(feed, future, poll_started)
+
+        return messages
+
+    def _submit(self, feed):
+        return self._pending_call(feed) or self._get_executor().submit(feed.get_messages)
+
+    def _wait_for(self, feed, future, poll_started):
+        try:
+            return self._completed(feed, future.result(self._seconds_left(feed, poll_started)))
+        except TimeoutError:
+            return self._timed_out(feed, future, poll_started)
+        except Exception:
+            self._failed(feed)
+            raise
+
+    def _get_executor(self):
+        if not self._executor:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+
+        return self._executor
+
+    @property
+    def max_workers(self):
+        return self._max_workers
+
+    def __str__(self):
+        return "Threaded poller (max-workers=%s)" % self._max_workers
+
+
+class AsyncioPoller(TimeLimitedPoller):
+    """
+    Polls all data-feeds at the same time from a single event loop. Data-feeds that don't implement
+    fetch_latest_messages() are run in the event loop's executor.
+    """
+
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, deadline=None, clock=time.monotonic,
+                 retry_after=TimeLimitedPoller.DEFAULT_RETRY_AFTER):
+        super().__init__(deadline, clock, retry_after)
+        self._max_workers = max_workers
+        self._loop = None
+
+    def poll(self, data_feeds):
+        if not data_feeds:
+            return []
+
+        results = self._get_loop().run_until_complete(self._fetch_all(data_feeds))
+
+        messages = []
+        for feed_messages in results:
+            messages += feed_messages
+
+        return messages
+
+    async def _fetch_all(self, data_feeds):
+        poll_started = self._clock()
+        return await asyncio.gather(*[self._fetch(feed, poll_started) for feed in data_feeds])
+
+    async def _fetch(self, feed, poll_started):
+        task = self._pending_call(feed) or asyncio.ensure_future(feed.fetch_messages())
+
+        try:
+            messages = await asyncio.wait_for(asyncio.shield(task), self._seconds_left(feed, poll_started))
+        except asyncio.TimeoutError:
+            return self._timed_out(feed, task, poll_started)
+        except Exception:
+            self._failed(feed)
+            raise
+
+        return self._completed(feed, messages)
+
+    def _get_loop(self):
+        if not self._loop:
+            self._loop = asyncio.new_event_loop()
+            self._loop.set_default_executor(ThreadPoolExecutor(max_workers=self._max_workers))
+
+        return self._loop
+
+    @property
+    def max_workers(self):
+        return self._max_workers
+
+    def __str__(self):
+        return "Asyncio poller (max-workers=%s)" % self._max_workers
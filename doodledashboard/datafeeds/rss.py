@@ -1,23 +1,63 @@
+import calendar
+import heapq
+import json
 import logging
+import os
+import time
+from urllib.parse import urlparse
+from xml.etree.ElementTree import ParseError
 
 import feedparser
+from requests import RequestException
 
-from doodledashboard.component import DataFeedCreator, MissingRequiredOptionException
-from doodledashboard.datafeeds.datafeed import DataFeed, Message
+from doodledashboard.component import DataFeedCreator, MissingRequiredOptionException, InvalidOptionException
+from doodledashboard.datafeeds.datafeed import DataFeed, Message, DataFeedUnavailable
+from doodledashboard.datafeeds.rss_stream import parse_entries
+from doodledashboard.http import get_session, DEFAULT_TIMEOUT
 
 
 class RssFeed(DataFeed):
+    """
+    Reads the entries of an RSS or Atom feed. The feed's ETag and Last-Modified headers are remembered, and optionally
+    saved to a cache file with the messages, so that an unchanged feed isn't downloaded and parsed again. Entries
+    already seen, with the same ID and updated date, reuse the message they were converted to before.
+
+    Large feeds can be limited to their newest entries, or those updated recently, without sorting every entry. Very
+    large feeds can also be streamed, so they are parsed as they download and the download stops once enough of the
+    newest entries have been read.
+    """
+
+    _STREAM_CHUNK_SIZE = 16 * 1024
     _COMMON_RSS_ITEM_FIELDS = ["title", "link", "description", "published", "id", "updated"]
     _SORT_ORDER = {
         "oldest": False,
         "newest": True
     }
 
-    def __init__(self, url, sort_order=None):
+    def __init__(self, url, sort_order=None, cache_path=None, max_entries=None, max_age=None, streaming=False,
+                 clock=time.time):
+        """
+        :param url: URL of the RSS or Atom feed
+        :param sort_order: 'newest' or 'oldest' to sort the entries by when they were updated, or None to leave as is
+        :param cache_path: File to save the feed's messages and validators to between restarts, or None
+        :param max_entries: Most entries to read, keeping the newest, or None to read every entry
+        :param max_age: Seconds since an entry was updated before it is ignored, or None to read entries of any age
+        :param streaming: True to parse the feed as it downloads, instead of with feedparser once it has downloaded
+        """
         DataFeed.__init__(self)
         self._logger = logging.getLogger(__name__)
         self._feed_url = url
         self._sort_order = sort_order
+        self._cache_path = cache_path
+        self._max_entries = max_entries
+        self._max_age = max_age
+        self._streaming = streaming
+        self._clock = clock
+        self._cache_loaded = False
+        self._etag = None
+        self._modified = None
+        self._messages = None
+        self._messages_by_entry = {}
 
     def get_url(self):
         return self._feed_url
@@ -25,29 +65,201 @@ class RssFeed(DataFeed):
     def get_sort_order(self):
         return self._sort_order
 
+    def get_cache_path(self):
+        return self._cache_path
+
+    def get_max_entries(self):
+        return self._max_entries
+
+    def get_max_age(self):
+        return self._max_age
+
+    def is_streaming(self):
+        return self._streaming
+
     def get_latest_messages(self):
+        if not self._cache_loaded:
+            self._load_cache()
+
         try:
-            feed = feedparser.parse(self._feed_url)
-        except RuntimeError as err:
-            self._logger.error("Failed to download RSS feed for %s due to %s", self._feed_url, err)
-            return []
+            feed = self._download_feed()
+        except (RequestException, ParseError) as err:
+            raise DataFeedUnavailable("Failed to download RSS feed for %s due to %s" % (self._feed_url, err))
+
+        if feed["status"] >= 400:
+            raise DataFeedUnavailable("Failed to download RSS feed for %s due to HTTP status %s" % (
+                self._feed_url, feed["status"]
+            ))
+
+        if feed["status"] == 304 and self._messages is not None:
+            self._logger.info("RSS feed for %s hasn't changed, so reusing its messages", self._feed_url)
+            self._messages = self._without_expired(self._messages)
+            return list(self._messages)
+
+        self._messages = self._convert_entries(self._select_entries(feed["entries"]))
+        self._etag = feed.get("etag")
+        self._modified = feed.get("modified")
+        self._save_cache()
+
+        return list(self._messages)
+
+    def _select_entries(self, entries):
+        if self._max_age is not None:
+            oldest = self._clock() - self._max_age
+            entries = [e for e in entries if RssFeed._updated_timestamp(e) >= oldest]
+
+        if self._max_entries is not None and len(entries) > self._max_entries:
+            return self._newest_entries(entries)
 
         if self._sort_order:
-            reverse = RssFeed._SORT_ORDER[self._sort_order]
-            sorted_entries = sorted(feed.entries, key=lambda x: x["updated_parsed"], reverse=reverse)
-        else:
-            sorted_entries = feed.entries
+            return sorted(entries, key=RssFeed._updated_timestamp, reverse=RssFeed._SORT_ORDER[self._sort_order])
 
-        return [self._convert_to_message(entry) for entry in sorted_entries]
+        return entries
 
-    def _convert_to_message(self, feed_item):
-        feed_fields = []
+    def _without_expired(self, messages):
+        """
+        Removes messages whose entries have passed the max-age since they were selected, such as those reused whilst
+        the feed is unchanged
+        """
+        if self._max_age is None:
+            return messages
+
+        oldest = self._clock() - self._max_age
+        return [m for m in messages if m.timestamp is not None and m.timestamp >= oldest]
+
+    def _newest_entries(self, entries):
+        if self._sort_order:
+            newest = heapq.nlargest(self._max_entries, entries, key=RssFeed._updated_timestamp)
+            return newest if RssFeed._SORT_ORDER[self._sort_order] else newest[::-1]
+
+        newest = heapq.nlargest(
+            self._max_entries, range(len(entries)), key=lambda i: RssFeed._updated_timestamp(entries[i])
+        )
+        return [entries[i] for i in sorted(newest)]
+
+    @staticmethod
+    def _updated_timestamp(entry):
+        updated = entry.get("updated_parsed") or entry.get("published_parsed")
+        return calendar.timegm(updated) if updated else float("-inf")
+
+    def _download_feed(self):
+        if urlparse(self._feed_url).scheme not in ["http", "https"]:
+            return self._read_local_feed()
+
+        with get_session().get(self._feed_url, headers=self._conditional_headers(), stream=self._streaming,
+                               timeout=DEFAULT_TIMEOUT) as response:
+            feed = {
+                "status": response.status_code,
+                "etag": response.headers.get("ETag"),
+                "modified": response.headers.get("Last-Modified"),
+                "entries": []
+            }
+
+            if response.status_code == 200:
+                feed["entries"] = self._parse_entries(response)
+
+        return feed
+
+    def _read_local_feed(self):
+        """
+        Reads a feed from a file path or 'file:' URL, which feedparser reads itself
+        """
+        parsed = feedparser.parse(self._feed_url)
+        return {"status": parsed.get("status", 200), "etag": None, "modified": None, "entries": parsed.entries}
 
-        for field in RssFeed._COMMON_RSS_ITEM_FIELDS:
-            if field in feed_item:
-                feed_fields.append(feed_item[field])
+    def _conditional_headers(self):
+        headers = {}
+        if self._messages is None:
+            return headers
 
-        return Message("\n".join(feed_fields), self.name)
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._modified:
+            headers["If-Modified-Since"] = self._modified
+
+        return headers
+
+    def _parse_entries(self, response):
+        if self._streaming:
+            return list(parse_entries(response.iter_content(self._STREAM_CHUNK_SIZE), self._max_entries))
+
+        return feedparser.parse(response.content, response_headers=response.headers).entries
+
+    def _load_cache(self):
+        self._cache_loaded = True
+        if not self._cache_path or not os.path.exists(self._cache_path):
+            return
+
+        try:
+            with open(self._cache_path, "r") as f:
+                cache = json.load(f)
+
+            if cache["url"] == self._feed_url:
+                self._etag = cache["etag"]
+                self._modified = cache["modified"]
+                self._messages = [
+                    Message(m["text"], self.name, timestamp=m["timestamp"], message_id=m["id"], payload=m["payload"])
+                    for m in cache["messages"]
+                ]
+        except (OSError, ValueError, KeyError, TypeError) as err:
+            self._logger.info("Ignoring unreadable RSS cache '%s': %s", self._cache_path, err)
+
+    def _save_cache(self):
+        if not self._cache_path:
+            return
+
+        cache = {
+            "url": self._feed_url,
+            "etag": self._etag,
+            "modified": self._modified,
+            "messages": [
+                {"text": m.text, "timestamp": m.timestamp, "id": m.id, "payload": dict(m.payload)}
+                for m in self._messages
+            ]
+        }
+
+        try:
+            with open(self._cache_path, "w") as f:
+                json.dump(cache, f)
+        except OSError as err:
+            self._logger.info("Failed to save RSS cache '%s': %s", self._cache_path, err)
+
+    def _convert_entries(self, entries):
+        messages_by_entry = {}
+        messages = []
+
+        for entry in entries:
+            key = RssFeed._entry_key(entry)
+            message = self._messages_by_entry.get(key) if key else None
+            if not message:
+                message = self._convert_to_message(entry)
+
+            if key:
+                messages_by_entry[key] = message
+            messages.append(message)
+
+        self._messages_by_entry = messages_by_entry
+        return messages
+
+    @staticmethod
+    def _entry_key(entry):
+        entry_id = entry.get("id") or entry.get("link")
+        if not entry_id:
+            return None
+
+        return entry_id, entry.get("updated") or entry.get("published")
+
+    def _convert_to_message(self, feed_item):
+        fields = [field for field in RssFeed._COMMON_RSS_ITEM_FIELDS if field in feed_item]
+        updated = RssFeed._updated_timestamp(feed_item)
+
+        return Message(
+            "\n".join(feed_item[field] for field in fields),
+            self.name,
+            timestamp=updated if updated != float("-inf") else None,
+            message_id=feed_item.get("id") or feed_item.get("link"),
+            payload={field: feed_item[field] for field in fields}
+        )
 
     def __str__(self):
         return "RSS feed for %s" % self._feed_url
@@ -73,4 +285,15 @@ class RssFeedCreator(DataFeedCreator):
 
             sort_order = options["sort"]
 
-        return RssFeed(url, sort_order)
+        cache_path = os.path.expanduser(options["cache-file"]) if "cache-file" in options else None
+
+        max_entries = options.get("max-entries")
+        if max_entries is not None and (isinstance(max_entries, bool) or not isinstance(max_entries, int)
+                                        or max_entries < 1):
+            raise InvalidOptionException("Expected 'max-entries' option to be a number greater than 0")
+
+        max_age = options.get("max-age")
+        if max_age is not None and (isinstance(max_age, bool) or not isinstance(max_age, (int, float)) or max_age < 0):
+            raise InvalidOptionException("Expected 'max-age' option to be a number of seconds")
+
+        return RssFeed(url, sort_order, cache_path, max_entries, max_age, bool(options.get("streaming", False)))
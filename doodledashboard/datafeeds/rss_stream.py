@@ -0,0 +1,67 @@
+from xml.etree.ElementTree import XMLPullParser
+
+try:
+    from feedparser.datetimes import _parse_date
+except ImportError:
+    from feedparser import _parse_date
+
+_ENTRY_TAGS = ["item", "entry"]
+_ENTRY_FIELDS = {
+    "title": "title",
+    "link": "link",
+    "description": "description",
+    "summary": "description",
+    "pubDate": "published",
+    "published": "published",
+    "guid": "id",
+    "id": "id",
+    "updated": "updated"
+}
+
+
+def parse_entries(chunks, max_entries=None):
+    """
+    Parses the entries of an RSS or Atom document as it arrives, instead of once it has all downloaded. Feeds list
+    their newest entries first, so the rest of the document can be ignored once enough entries have been read.
+    :param chunks: Pieces of an RSS or Atom document, in order
+    :param max_entries: Entries to read before the rest of the document is ignored, or None to read them all
+    :return: Generator of entries, as dicts named the same as feedparser's entries
+    """
+    parser = XMLPullParser(events=["end"])
+    read = 0
+
+    for chunk in chunks:
+        parser.feed(chunk)
+
+        for _, element in parser.read_events():
+            if _local_name(element.tag) not in _ENTRY_TAGS:
+                continue
+
+            yield _to_entry(element)
+            element.clear()
+
+            read += 1
+            if max_entries is not None and read >= max_entries:
+                return
+
+
+def _to_entry(element):
+    entry = {}
+    for child in element:
+        field = _ENTRY_FIELDS.get(_local_name(child.tag))
+        if not field or field in entry:
+            continue
+
+        text = child.get("href") if field == "link" and child.get("href") else child.text
+        if text and text.strip():
+            entry[field] = text.strip()
+
+    for field in ["published", "updated"]:
+        if field in entry:
+            entry[field + "_parsed"] = _parse_date(entry[field])
+
+    return entry
+
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
@@ -0,0 +1,64 @@
+import logging
+import random
+import time
+
+from doodledashboard.datafeeds.datafeed import DataFeedDecorator
+
+
+class ScheduledDataFeed(DataFeedDecorator):
+    """
+    Only polls the data-feed it wraps once its refresh interval has passed, serving the messages from the last refresh
+    in between
+    """
+
+    def __init__(self, data_feed, refresh_interval, jitter=0, clock=time.monotonic, get_jitter=random.uniform):
+        """
+        :param data_feed: Data-feed to refresh
+        :param refresh_interval: Seconds between each refresh of the data-feed
+        :param jitter: Up to this many seconds are randomly added to each interval, so feeds with the same interval
+        don't all refresh in the same cycle
+        """
+        super().__init__(data_feed)
+        self._logger = logging.getLogger(__name__)
+        self._refresh_interval = refresh_interval
+        self._jitter = jitter
+        self._clock = clock
+        self._get_jitter = get_jitter
+        self._next_refresh = None
+        self._messages = []
+
+    def get_latest_messages(self):
+        now = self._clock()
+        if self._is_due(now):
+            self._refreshed(now, self._data_feed.get_latest_messages())
+
+        return list(self._messages)
+
+    async def fetch_latest_messages(self):
+        now = self._clock()
+        if self._is_due(now):
+            self._refreshed(now, await self._data_feed.fetch_latest_messages())
+
+        return list(self._messages)
+
+    def _is_due(self, now):
+        if self._next_refresh is None or now >= self._next_refresh:
+            return True
+
+        self._logger.debug("Serving cached messages for '%s' until its next refresh", self.name)
+        return False
+
+    def _refreshed(self, refresh_time, messages):
+        self._messages = messages
+        self._next_refresh = refresh_time + self._refresh_interval + self._get_jitter(0, self._jitter)
+
+    @property
+    def refresh_interval(self):
+        return self._refresh_interval
+
+    @property
+    def jitter(self):
+        return self._jitter
+
+    def __str__(self):
+        return "%s (refreshed every %ss)" % (str(self._data_feed), self._refresh_interval)
@@ -1,92 +1,75 @@
 import logging
 
 from requests import ConnectionError
-from slackclient import SlackClient
 
-from doodledashboard.component import DataFeedCreator, MissingRequiredOptionException
+from doodledashboard.component import DataFeedCreator, MissingRequiredOptionException, InvalidOptionException
 from doodledashboard.datafeeds.datafeed import DataFeed, Message
+from doodledashboard.datafeeds.slack_channels import SlackChannelIndex, SlackChannelListUnavailable, \
+    get_channel_index
+from doodledashboard.datafeeds.slack_rtm import EventBuffer, Subscription, get_connection
 from doodledashboard.secrets_store import SecretNotFound
 
 
 class SlackFeed(DataFeed):
-    _channel = None
-
-    def __init__(self, channel_name, client):
+    """
+    Reads messages from Slack channels, subscribing to them on a Real Time Messaging connection which can be shared
+    with other Slack feeds.
+    """
+
+    def __init__(self, channel_names, connection, channel_index=None, buffer_size=EventBuffer.DEFAULT_SIZE,
+                 overflow=Subscription.KEEP_LATEST_PER_CHANNEL):
+        """
+        :param channel_names: Names of the channels to read messages from
+        :param connection: SlackRtmConnection the channels are subscribed to
+        :param channel_index: SlackChannelIndex used to find the channels' IDs
+        :param buffer_size: Most events buffered between polls, for the feed or for each channel depending on overflow
+        :param overflow: Subscription policy deciding which events are dropped once the buffer is full
+        """
         DataFeed.__init__(self)
-        self._client = client
-        self._channel_name = channel_name
+        self._connection = connection
+        self._channel_index = channel_index or SlackChannelIndex(connection.client)
+        self._channel_names = channel_names
+        self._subscription = connection.subscribe(buffer_size, overflow)
+        self._channel_ids = {}
         self._logger = logging.getLogger(__name__)
-        self._connected = False
-        self._connected_previously = False
 
     def get_latest_messages(self):
-        if not self._connected:
-            self._connected = self._try_connect()
-
-        if not self._test_connection():
-            self._logger.info("Failed to connect to Slack, will try again next time around")
-            self._connected = False
-            return []
-
-        if not self._channel:
-            self._channel = self._try_find_channel(self._channel_name)
-
-        events = self._client.rtm_read()
-        self._logger.info("Events from Slack: %s", events)
-
-        if len(events) is 1 and events[0]["type"] == "hello":
-            self._logger.info("Slack connection confirmed with hello: %s", events)
-            events = self._client.rtm_read()
-            self._logger.info("Events from Slack: %s", events)
+        self._subscribe_to_channels()
 
-        events = SlackFeed._filter_events_by_channel(self._channel, events)
+        events = self._connection.take_events(self._subscription)
         events = SlackFeed._filter_events_by_type(events, "message")
         events = SlackFeed._filter_events_with_text(events)
 
-        return [Message(event["text"], self.name) for event in events]
+        return [SlackFeed._convert_to_message(event, self.name) for event in events]
 
-    def _test_connection(self):
-        connected = False
-        try:
-            response = self._client.api_call("api.test")
-            if response["ok"]:
-                connected = True
-            else:
-                self._logger.info("Slack threw the error '%s'", response['error'])
-        except ConnectionError:
-            connected = False
-        return connected
-
-    def _try_connect(self):
-        connected = self._client.rtm_connect(with_team_state=False)
-        if connected:
-            self._logger.info("Connected to Slack. Huzzah!")
-            self._connected_previously = True
-        else:
-            if self._connected_previously:
-                message = "Failed to connect to Slack. I've connected before so likely the internet is just down."
-            else:
-                message = "Failed to connect to Slack. Is the Slack token correct?"
-
-            self._logger.info(message)
-
-        return connected
-
-    def _try_find_channel(self, channel_name):
-        channel = None
+    @staticmethod
+    def _convert_to_message(event, source_name):
+        timestamp = float(event["ts"]) if "ts" in event else None
+        return Message(
+            event["text"], source_name, timestamp=timestamp, message_id=event.get("ts"), payload=event
+        )
+
+    def _subscribe_to_channels(self):
+        for channel_name in self._channel_names:
+            if channel_name in self._channel_ids:
+                continue
+
+            channel_id = self._try_find_channel_id(channel_name)
+            if channel_id:
+                self._connection.add_channel(self._subscription, channel_id)
+                self._channel_ids[channel_name] = channel_id
+
+    def _try_find_channel_id(self, channel_name):
+        channel_id = None
         try:
-            channel = self._find_channel(channel_name)
-            if not channel:
+            channel_id = self._channel_index.find_channel_id(channel_name)
+            if not channel_id:
                 self._logger.info(
-                    "Failed to find Slack channel '%s'. Have you provided created it?", self._channel_name)
-        except ConnectionError:
-            pass
-
-        return channel
+                    "Failed to find Slack channel '%s'. Have you provided created it?", channel_name)
+        except (ConnectionError, SlackChannelListUnavailable) as err:
+            self._logger.info("Failed to find Slack channel '%s': %s", channel_name, err)
 
-    def _find_channel(self, channel_name):
-        channel_list = self._client.api_call("channels.list", exclude_archived=1)
-        return next(iter([c for c in channel_list["channels"] if c["name"] == channel_name]), None)
+        return channel_id
 
     @staticmethod
     def _filter_events_with_text(events):
@@ -96,12 +79,8 @@ class SlackFeed(DataFeed):
     def _filter_events_by_type(events, type):
         return [e for e in events if e["type"] == type]
 
-    @staticmethod
-    def _filter_events_by_channel(channel, events):
-        return [e for e in events if "channel" in e and e["channel"] == channel["id"]]
-
     def __str__(self):
-        return "Slack feed for %s channel" % self._channel_name
+        return "Slack feed for %s channel" % ", ".join(self._channel_names)
 
 
 class SlackFeedCreator(DataFeedCreator):
@@ -115,12 +94,25 @@ class SlackFeedCreator(DataFeedCreator):
         if "token" not in options:
             raise MissingRequiredOptionException("Expected 'token' option to exist")
 
-        if "channel" not in options:
-            raise MissingRequiredOptionException("Expected 'channel' option to exist")
+        if "channel" not in options and "channels" not in options:
+            raise MissingRequiredOptionException("Expected 'channel' or 'channels' option to exist")
 
         slack_token = secret_store.get(self._SECRET_TOKEN_ID)
         if not slack_token:
             raise SecretNotFound(self, self._SECRET_TOKEN_ID)
 
-        channel = options["channel"]
-        return SlackFeed(channel, SlackClient(slack_token))
+        buffer_size = options.get("buffer-size", EventBuffer.DEFAULT_SIZE)
+        if isinstance(buffer_size, bool) or not isinstance(buffer_size, int) or buffer_size < 1:
+            raise InvalidOptionException("Expected 'buffer-size' option to be a number greater than 0")
+
+        overflow = options.get("overflow", Subscription.KEEP_LATEST_PER_CHANNEL)
+        if overflow not in Subscription.OVERFLOW_POLICIES:
+            raise InvalidOptionException(
+                "Expected 'overflow' option to be one of %s" % ", ".join(Subscription.OVERFLOW_POLICIES)
+            )
+
+        channels = options["channels"] if "channels" in options else [options["channel"]]
+        connection = get_connection(slack_token)
+        return SlackFeed(
+            channels, connection, get_channel_index(slack_token, connection.client), buffer_size, overflow
+        )
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from requests import ConnectionError
+
+
+class SlackChannelIndex:
+    """
+    Maps the names of a Slack workspace's channels to their IDs. The channel list is downloaded a page at a time and
+    kept, in memory and on disk, until its time-to-live passes, so Slack feeds sharing a token share one download.
+    """
+
+    DEFAULT_TTL = 3600
+    _PAGE_SIZE = 200
+    _MIN_SECONDS_BETWEEN_REFRESHES = 60
+
+    def __init__(self, client, cache_path=None, ttl=DEFAULT_TTL, clock=time.time):
+        """
+        :param client: SlackClient used to list the workspace's channels
+        :param cache_path: File the index is persisted to between restarts, or None to keep it in memory
+        :param ttl: Seconds before the index is downloaded again
+        :param clock: Wall-clock time, so an index persisted before a restart can be aged
+        """
+        self._logger = logging.getLogger(__name__)
+        self._client = client
+        self._cache_path = cache_path
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._channel_ids = None
+        self._refreshed_at = None
+
+    def find_channel_id(self, channel_name):
+        """
+        :return: ID of the channel, or None if the workspace has no channel with that name
+        """
+        with self._lock:
+            if self._channel_ids is None:
+                self._load()
+
+            if self._expired() or (channel_name not in self._channel_ids and self._may_refresh()):
+                self._try_refresh()
+
+            return self._channel_ids.get(channel_name)
+
+    def _expired(self):
+        return self._refreshed_at is None or self._clock() - self._refreshed_at >= self._ttl
+
+    def _may_refresh(self):
+        return self._clock() - self._refreshed_at >= self._MIN_SECONDS_BETWEEN_REFRESHES
+
+    def _try_refresh(self):
+        try:
+            self._refresh()
+        except (ConnectionError, SlackChannelListUnavailable) as err:
+            if not self._channel_ids:
+                raise
+
+            self._logger.info("Failed to refresh Slack channels, so reusing the previous list: %s", err)
+
+    def _refresh(self):
+        self._channel_ids = self._download()
+        self._refreshed_at = self._clock()
+        self._save()
+
+    def _download(self):
+        channel_ids = {}
+        page = {}
+
+        while True:
+            response = self._client.api_call(
+                "channels.list", exclude_archived=1, exclude_members=1, limit=self._PAGE_SIZE, **page
+            )
+            if not response.get("ok"):
+                raise SlackChannelListUnavailable(response.get("error", "unknown error"))
+
+            for channel in response["channels"]:
+                channel_ids[channel["name"]] = channel["id"]
+
+            cursor = response.get("response_metadata", {}).get("next_cursor")
+            if not cursor:
+                return channel_ids
+
+            page = {"cursor": cursor}
+
+    def _load(self):
+        self._channel_ids = {}
+        if not self._cache_path or not os.path.exists(self._cache_path):
+            return
+
+        try:
+            with open(self._cache_path, "r") as f:
+                cache = json.load(f)
+
+            self._channel_ids = cache["channels"]
+            self._refreshed_at = cache["refreshed-at"]
+        except (OSError, ValueError, KeyError) as err:
+            self._logger.info("Ignoring unreadable Slack channel cache '%s': %s", self._cache_path, err)
+
+    def _save(self):
+        if not self._cache_path:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self._cache_path), exist_ok=True)
+            with open(self._cache_path, "w") as f:
+                json.dump({"refreshed-at": self._refreshed_at, "channels": self._channel_ids}, f)
+        except OSError as err:
+            self._logger.info("Failed to save Slack channel cache '%s': %s", self._cache_path, err)
+
+
+class SlackChannelListUnavailable(Exception):
+    def __init__(self, error):
+        self._error = error
+
+    def __str__(self):
+        return "Slack refused to list channels: %s" % self._error
+
+    @property
+    def error(self):
+        return self._error
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_channel_index(token, client):
+    """
+    :return: The channel index shared by every Slack feed using the token
+    """
+    with _indexes_lock:
+        if token not in _indexes:
+            _indexes[token] = SlackChannelIndex(client, default_cache_path(token))
+
+        return _indexes[token]
+
+
+def default_cache_path(token):
+    workspace_id = hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(os.path.expanduser("~"), ".doodledashboard", "cache", "slack-channels-%s.json" % workspace_id)
@@ -0,0 +1,309 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from operator import itemgetter
+
+from requests import ConnectionError
+from slackclient import SlackClient
+from slackclient.server import SlackConnectionError
+from websocket import WebSocketException
+
+from doodledashboard.datafeeds.datafeed import DataFeedUnavailable
+
+
+class EventBuffer:
+    """
+    Holds up to a fixed number of events until they are taken, dropping the oldest to make room once full
+    """
+
+    DEFAULT_SIZE = 100
+
+    def __init__(self, size=DEFAULT_SIZE):
+        self._size = size
+        self._events = deque(maxlen=size)
+        self._dropped = 0
+
+    def append(self, event):
+        if len(self._events) == self._size:
+            self._dropped += 1
+
+        self._events.append(event)
+
+    def take(self):
+        """
+        :return: The buffered events and how many were dropped since the buffer was last taken
+        """
+        events, dropped = self._events, self._dropped
+        self._events = deque(maxlen=self._size)
+        self._dropped = 0
+
+        return events, dropped
+
+    @property
+    def size(self):
+        return self._size
+
+
+class Subscription:
+    """
+    The channels a subscriber, such as a Slack feed, reads from and the events buffered for it. Once there are too many
+    events, either the oldest events from any of its channels are dropped, or the oldest from the channel that has too
+    many, so each channel keeps its latest events. Events are numbered as they arrive, so they're taken in the order
+    they arrived whichever channel they're from.
+    """
+
+    DROP_OLDEST = "drop-oldest"
+    KEEP_LATEST_PER_CHANNEL = "keep-latest-per-channel"
+    OVERFLOW_POLICIES = [DROP_OLDEST, KEEP_LATEST_PER_CHANNEL]
+
+    def __init__(self, buffer_size=EventBuffer.DEFAULT_SIZE, overflow=KEEP_LATEST_PER_CHANNEL):
+        """
+        :param buffer_size: Most events buffered for the subscriber, or for each of its channels if keeping the latest
+        per channel
+        :param overflow: Policy deciding which events are dropped once the buffer is full
+        """
+        self._buffer_size = buffer_size
+        self._overflow = overflow
+        self._buffers = {}
+        self._shared_buffer = EventBuffer(buffer_size) if overflow == self.DROP_OLDEST else None
+        self._sequence = itertools.count()
+
+    def add_channel(self, channel_id):
+        if channel_id not in self._buffers:
+            self._buffers[channel_id] = self._shared_buffer if self._shared_buffer is not None else EventBuffer(
+                self._buffer_size
+            )
+
+    def append(self, event):
+        buffer = self._buffers.get(event.get("channel"))
+        if buffer is not None:
+            buffer.append((next(self._sequence), event))
+
+    def take(self):
+        """
+        :return: The buffered events, in the order they arrived, and how many were dropped since they were last taken
+        """
+        numbered_events, dropped = [], 0
+        for buffer in self._distinct_buffers():
+            buffer_events, buffer_dropped = buffer.take()
+            numbered_events.append(buffer_events)
+            dropped += buffer_dropped
+
+        return [event for _, event in heapq.merge(*numbered_events, key=itemgetter(0))], dropped
+
+    def _distinct_buffers(self):
+        if self._shared_buffer is not None:
+            return [self._shared_buffer]
+
+        return list(self._buffers.values())
+
+    @property
+    def channel_ids(self):
+        return list(self._buffers)
+
+    @property
+    def buffer_size(self):
+        return self._buffer_size
+
+    @property
+    def overflow(self):
+        return self._overflow
+
+
+class SlackRtmConnection:
+    """
+    A Real Time Messaging websocket shared by the Slack feeds using the same token. Events read from the websocket are
+    buffered for every subscriber to their channel, and dropped for every other channel. The websocket is either read
+    whenever events are taken, or continuously by a background thread once started.
+
+    The connection's health is judged by the events arriving on the websocket, which is pinged when it has been quiet
+    and disconnected if nothing, not even the reply, arrives in time after the ping. The Web API is only used to
+    explain why connecting failed.
+    """
+
+    _PING_AFTER = 30
+    _PING_TIMEOUT = 60
+    _READ_INTERVAL = 0.1
+    _RECONNECT_INTERVAL = 5
+
+    def __init__(self, client, clock=time.monotonic):
+        self._logger = logging.getLogger(__name__)
+        self._client = client
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._subscriptions = []
+        self._connected = False
+        self._connected_previously = False
+        self._last_event_time = None
+        self._last_ping_time = None
+        self._reader = None
+        self._reader_error = None
+        self._stopped = threading.Event()
+
+    @property
+    def client(self):
+        return self._client
+
+    def subscribe(self, buffer_size=EventBuffer.DEFAULT_SIZE, overflow=Subscription.KEEP_LATEST_PER_CHANNEL):
+        """
+        :return: Subscription with its own buffer, which channels are added to with add_channel()
+        """
+        subscription = Subscription(buffer_size, overflow)
+        with self._lock:
+            self._subscriptions.append(subscription)
+
+        return subscription
+
+    def add_channel(self, subscription, channel_id):
+        with self._lock:
+            subscription.add_channel(channel_id)
+
+    def start(self):
+        """
+        Reads the websocket from a background thread, so taking events no longer waits on Slack
+        """
+        with self._lock:
+            if not self._reader:
+                self._reader = threading.Thread(target=self._read_forever, name="slack-reader", daemon=True)
+                self._reader.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._reader:
+            self._reader.join()
+
+    def take_events(self, subscription):
+        """
+        Removes and returns the events buffered for the subscriber, reading the websocket first unless it is being read
+        in the background
+        :param subscription: Subscription returned by subscribe()
+        :return: Events from the subscription's channels
+        """
+        if not self._reader:
+            self._read()
+
+        with self._lock:
+            events, dropped = subscription.take()
+
+        if dropped:
+            self._logger.info("Dropped %s events from Slack channels %s as their buffer was full", dropped,
+                              ", ".join(subscription.channel_ids))
+
+        if not events and self._reader_error:
+            raise self._reader_error
+
+        return events
+
+    def _read_forever(self):
+        while not self._stopped.is_set():
+            try:
+                self._read()
+                self._reader_error = None
+            except DataFeedUnavailable as err:
+                self._reader_error = err
+                self._logger.info("Slack reader will reconnect in %ss: %s", self._RECONNECT_INTERVAL, err.message)
+                self._stopped.wait(self._RECONNECT_INTERVAL)
+            except Exception:
+                self._logger.exception("Slack reader failed to read events")
+                self._stopped.wait(self._RECONNECT_INTERVAL)
+            else:
+                self._stopped.wait(self._READ_INTERVAL)
+
+    def _read(self):
+        with self._read_lock:
+            if not self._connected:
+                self._connect()
+
+            events = self._read_events()
+
+        with self._lock:
+            self._dispatch(events)
+
+    def _dispatch(self, events):
+        for event in events:
+            for subscription in self._subscriptions:
+                subscription.append(event)
+
+    def _connect(self):
+        if not self._try_connect():
+            self._test_connection()
+            raise DataFeedUnavailable("Failed to connect to Slack, will try again next time around")
+
+        self._connected = True
+        self._last_event_time = self._clock()
+        self._last_ping_time = None
+
+    def _read_events(self):
+        try:
+            events = self._client.rtm_read()
+        except (WebSocketException, SlackConnectionError, ConnectionError, OSError) as err:
+            self._disconnected("Lost connection to Slack due to %s" % err)
+
+        now = self._clock()
+        if events:
+            self._logger.info("Events from Slack: %s", events)
+            self._last_event_time = now
+            self._last_ping_time = None
+        else:
+            self._check_quiet_connection(now)
+
+        return events
+
+    def _check_quiet_connection(self, now):
+        if self._last_ping_time is not None:
+            if now - self._last_ping_time >= self._PING_TIMEOUT:
+                self._disconnected("Nothing received from Slack for %ds after pinging it" % (now - self._last_ping_time))
+        elif now - self._last_event_time >= self._PING_AFTER:
+            self._client.server.ping()
+            self._last_ping_time = now
+
+    def _disconnected(self, reason):
+        self._connected = False
+        raise DataFeedUnavailable(reason)
+
+    def _test_connection(self):
+        connected = False
+        try:
+            response = self._client.api_call("api.test")
+            if response["ok"]:
+                connected = True
+            else:
+                self._logger.info("Slack threw the error '%s'", response['error'])
+        except ConnectionError:
+            connected = False
+        return connected
+
+    def _try_connect(self):
+        connected = self._client.rtm_connect(with_team_state=False)
+        if connected:
+            self._logger.info("Connected to Slack. Huzzah!")
+            self._connected_previously = True
+        else:
+            if self._connected_previously:
+                message = "Failed to connect to Slack. I've connected before so likely the internet is just down."
+            else:
+                message = "Failed to connect to Slack. Is the Slack token correct?"
+
+            self._logger.info(message)
+
+        return connected
+
+
+_connections = {}
+_connections_lock = threading.Lock()
+
+
+def get_connection(token):
+    """
+    :return: The RTM connection shared by every Slack feed using the token
+    """
+    with _connections_lock:
+        if token not in _connections:
+            _connections[token] = SlackRtmConnection(SlackClient(token))
+            _connections[token].start()
+
+        return _connections[token]
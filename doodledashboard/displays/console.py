@@ -68,9 +68,11 @@ class ConsoleDisplay(Display):
         self._show_notification_name = show_notification_name
         self._seconds_per_notification = period
         self._get_size = get_size
+        self._terminal_size = None
 
     def _calculate_new_size(self):
         size = self._get_size()
+        self._terminal_size = size
         if self._show_notification_name and size[1] > 1:
             self._size = self._reduce_height_by_1(size)
         else:
@@ -88,6 +90,12 @@ class ConsoleDisplay(Display):
         click.echo(factory(self._size, notification_output), nl=False)
         time.sleep(self._seconds_per_notification)
 
+    def draw_unchanged(self, notification_output):
+        if self._get_size() != self._terminal_size:
+            self.draw(notification_output)
+        else:
+            time.sleep(self._seconds_per_notification)
+
     def _find_factory(self, notification, default=lambda x, y: ConsoleDisplay._UNSUPPORTED_NOTIFICATION_ERROR % str(y)):
         for factory_type, factory in self._NOTIFICATIONS.items():
             if isinstance(notification, factory_type):
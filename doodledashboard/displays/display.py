@@ -14,12 +14,21 @@ class Display(NamedComponent):
         Called by the dashboard when the display should try and draw the notification.
 
         Implementations should block the thread whilst the display is showing a notification, as soon as the thread is
-        unblocked then all data-sources will be polled.
+        unblocked then all data-sources will be polled, unless the dashboard polls them in the background.
 
         :param notification_output: The notification to draw that is of a type returned by
         `get_supported_notifications()`
         """
 
+    def draw_unchanged(self, notification_output):
+        """
+        Called by the dashboard instead of draw() when the notification is the same as the one it last drew, so
+        displays that are still showing it can avoid drawing it again. It is drawn again unless overridden.
+
+        :param notification_output: The notification that was last drawn
+        """
+        self.draw(notification_output)
+
     @staticmethod
     @abstractmethod
     def get_supported_notifications():
@@ -1,4 +1,4 @@
-from doodledashboard.dashboard import DisplayDoesNotSupportNotification
+from doodledashboard.dashboard import DisplayDoesNotSupportNotification, PollerDoesNotSupportTimeouts
 
 from doodledashboard.configuration import EmptyConfiguration, DisplayNotFound, ConfigYamlParsingError
 from doodledashboard.notifications.image.image import ImageUnavailable
@@ -45,6 +45,11 @@ def display_does_not_support_notification(err: DisplayDoesNotSupportNotification
     return "Display '%s' does not support any notification outputs, which is very odd..." % err.display
 
 
+def poller_does_not_support_timeouts(err: PollerDoesNotSupportTimeouts):
+    return "The data-feed '%s' has a timeout, but the '%s' cannot stop waiting for it. Set the polling mode to " \
+           "'threads' or 'asyncio' to use timeouts." % (err.data_feed, err.poller)
+
+
 def data_feed_could_not_find_a_secret(err: SecretNotFound):
     return "The secret '%s' is missing from your secrets file according to the data feed config '%s'" % (
         err.missing_token, err.data_feed_config.get_id()
@@ -61,6 +66,7 @@ error_messages = {
     SecretsYamlParsingError: error_parsing_yaml,
     DisplayNotFound: display_not_found,
     DisplayDoesNotSupportNotification: display_does_not_support_notification,
+    PollerDoesNotSupportTimeouts: poller_does_not_support_timeouts,
     SecretNotFound: data_feed_could_not_find_a_secret,
     ImageUnavailable: failed_to_download_image
 }
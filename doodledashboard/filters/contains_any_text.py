@@ -0,0 +1,160 @@
+from collections import deque
+
+from doodledashboard.component import FilterCreator, MissingRequiredOptionException, InvalidOptionException
+from doodledashboard.filters.filter import MessageFilter, read_message
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton that finds any number of keywords in a single pass over a text, so searching for many
+    keywords takes no longer than searching for one.
+    """
+
+    def __init__(self, keywords):
+        self._keywords = list(keywords)
+        self._transitions = [{}]
+        self._failures = [0]
+        self._matches = [[]]
+
+        for index, keyword in enumerate(self._keywords):
+            self._add(keyword, index)
+
+        self._link_failures()
+
+    def _add(self, keyword, index):
+        state = 0
+        for character in keyword:
+            if character not in self._transitions[state]:
+                self._transitions.append({})
+                self._failures.append(0)
+                self._matches.append([])
+                self._transitions[state][character] = len(self._transitions) - 1
+
+            state = self._transitions[state][character]
+
+        self._matches[state].append(index)
+
+    def _link_failures(self):
+        """
+        Links each state to the state of its longest suffix that starts a keyword, breadth first so the suffix's state
+        is always linked before it is needed
+        """
+        queue = deque(self._transitions[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for character, next_state in self._transitions[state].items():
+                queue.append(next_state)
+
+                failure = self._failures[state]
+                while failure and character not in self._transitions[failure]:
+                    failure = self._failures[failure]
+
+                failure = self._transitions[failure].get(character, 0)
+                self._failures[next_state] = failure
+                if failure:
+                    self._matches[next_state] = self._matches[next_state] + self._matches[failure]
+
+    def find_first(self, text):
+        """
+        :return: The first keyword to end in the text, or None if the text contains none of them
+        """
+        for index in self._scan(text):
+            return self._keywords[index]
+
+        return None
+
+    def find_all(self, text):
+        """
+        :return: Every keyword in the text, in the order they are first found
+        """
+        found = []
+        for index in self._scan(text):
+            if self._keywords[index] not in found:
+                found.append(self._keywords[index])
+
+        return found
+
+    def _scan(self, text):
+        transitions, failures, matches = self._transitions, self._failures, self._matches
+
+        yield from matches[0]
+
+        state = 0
+        for character in text:
+            while state and character not in transitions[state]:
+                state = failures[state]
+
+            state = transitions[state].get(character, 0)
+            yield from matches[state]
+
+    @property
+    def keywords(self):
+        return self._keywords
+
+
+class ContainsAnyTextFilter(MessageFilter):
+
+    cost = 3
+
+    def __init__(self, texts, field=None):
+        """
+        :param texts: Texts the message has to contain at least one of
+        :param field: Field of the message's payload to search instead of its text
+        """
+        MessageFilter.__init__(self)
+        self._automaton = KeywordAutomaton(texts)
+        self._field = field
+
+    def filter(self, message):
+        return self.find_first_text(message) is not None
+
+    def compile(self):
+        if self._field is not None:
+            return self.filter
+
+        find_first = self._automaton.find_first
+        return lambda message: find_first(message.text) is not None
+
+    def find_first_text(self, message):
+        """
+        :return: The first of the texts found in the message, or None if it contains none of them
+        """
+        value = read_message(message, self._field)
+        return None if value is None else self._automaton.find_first(value)
+
+    def find_texts(self, message):
+        """
+        :return: Every one of the texts found in the message
+        """
+        value = read_message(message, self._field)
+        return [] if value is None else self._automaton.find_all(value)
+
+    @property
+    def texts(self):
+        return self._automaton.keywords
+
+    @property
+    def field(self):
+        return self._field
+
+    @property
+    def key(self):
+        return (ContainsAnyTextFilter, tuple(self.texts), self._field)
+
+
+class ContainsAnyTextFilterCreator(FilterCreator):
+
+    @staticmethod
+    def get_id():
+        return "message-contains-any-text"
+
+    def create(self, options, secret_store):
+        if "texts" not in options:
+            raise MissingRequiredOptionException("Expected 'texts' option to exist")
+
+        texts = options["texts"]
+        if not isinstance(texts, list) or not texts:
+            raise InvalidOptionException("Expected 'texts' option to be a list of texts")
+
+        return ContainsAnyTextFilter([str(text) for text in texts], options.get("field"))
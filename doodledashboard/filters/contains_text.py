@@ -1,14 +1,27 @@
 from doodledashboard.component import FilterCreator, MissingRequiredOptionException
-from doodledashboard.filters.filter import MessageFilter
+from doodledashboard.filters.filter import MessageFilter, read_message
 
 
 class ContainsTextFilter(MessageFilter):
-    def __init__(self, text):
+    def __init__(self, text, field=None):
+        """
+        :param text: Text the message has to contain
+        :param field: Field of the message's payload to search instead of its text
+        """
         MessageFilter.__init__(self)
         self._text = text
+        self._field = field
 
     def filter(self, message):
-        return self._text in message.text
+        value = read_message(message, self._field)
+        return value is not None and self._text in value
+
+    def compile(self):
+        if self._field is not None:
+            return self.filter
+
+        text = self._text
+        return lambda message: text in message.text
 
     def remove_text(self, text_entity):
         return text_entity.text \
@@ -19,6 +32,14 @@ class ContainsTextFilter(MessageFilter):
     def text(self):
         return self._text
 
+    @property
+    def field(self):
+        return self._field
+
+    @property
+    def key(self):
+        return (ContainsTextFilter, self._text, self._field)
+
 
 class ContainsTextFilterCreator(FilterCreator):
 
@@ -30,4 +51,4 @@ class ContainsTextFilterCreator(FilterCreator):
         if "text" not in options:
             raise MissingRequiredOptionException("Expected 'text' option to exist")
 
-        return ContainsTextFilter(str(options["text"]))
+        return ContainsTextFilter(str(options["text"]), options.get("field"))
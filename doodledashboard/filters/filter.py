@@ -4,6 +4,13 @@ from doodledashboard.component import NamedComponent
 
 
 class MessageFilter(NamedComponent):
+    """
+    Filters whose check is more expensive than comparing a message's source and searching its text for a string, such
+    as those matching patterns or calling a service, should raise their cost so cheaper filters are tried first.
+    """
+
+    cost = 1
+
     def __init__(self):
         super().__init__()
 
@@ -13,3 +20,125 @@ class MessageFilter(NamedComponent):
         :param message: Message to filter
         :return: True if the message should be kept, otherwise false.
         """
+
+    def compile(self):
+        """
+        Called once, when the filter is loaded, to get the function used to filter each message. Filters can return a
+        function that avoids the overhead of filter(), such as looking up their options on every call.
+        :return: Function that takes a message and returns False if it should be removed
+        """
+        return self.filter
+
+    @property
+    def selected_source(self):
+        """
+        :return: Name of the data-feed whose messages, and only whose messages, the filter keeps, so they can be looked
+        up instead of filtered, or None if the filter keeps messages for other reasons
+        """
+        return None
+
+    @property
+    def key(self):
+        """
+        :return: Hashable value that is the same for filters that give the same results, so their results can be shared
+        between notifications, or None if they can't
+        """
+        return None
+
+
+class FilterResults:
+    """
+    Shares filters' results between the notifications of a dashboard, so a filter declared by several notifications is
+    evaluated once per message. Results are kept for the batch of messages being filtered, and forgotten as soon as a
+    different batch is.
+
+    Looking up a result costs about as much as comparing a message's source or searching its text, so only filters
+    costing at least MIN_SHARED_COST are shared.
+    """
+
+    MIN_SHARED_COST = 2
+
+    def __init__(self):
+        self._batch = None
+        self._results = {}
+
+    def start_batch(self, messages):
+        """
+        :param messages: Messages about to be filtered, the same list being given to every notification in a cycle
+        """
+        if messages is not self._batch:
+            self._batch = messages
+            for results in self._results.values():
+                results.clear()
+
+    def share(self, key, check):
+        """
+        :return: Function that only calls the check for messages in the batch that no filter with the key has checked
+        """
+        results = self._results.setdefault(key, {})
+
+        def shared_check(message):
+            result = results.get(id(message), _NOT_CHECKED)
+            if result is _NOT_CHECKED:
+                result = results[id(message)] = check(message)
+
+            return result
+
+        return shared_check
+
+
+_NOT_CHECKED = object()
+
+
+def compile_filters(message_filters, filter_results=None):
+    """
+    Combines filters into a single function that keeps the messages kept by every filter. The filters are tried
+    cheapest first, and the rest are skipped once a filter removes the message.
+    :param message_filters: Filters to combine
+    :param filter_results: FilterResults to share the filters' results through, or None to evaluate them separately
+    :return: Function that takes a message and returns True if it should be kept
+    """
+    checks = tuple(
+        _compile_filter(message_filter, filter_results)
+        for message_filter in sorted(message_filters, key=_filter_cost)
+    )
+
+    if not checks:
+        return lambda message: True
+
+    if len(checks) == 1:
+        check = checks[0]
+        return lambda message: check(message) is not False
+
+    def keep(message):
+        for check in checks:
+            if check(message) is False:
+                return False
+        return True
+
+    return keep
+
+
+def _compile_filter(message_filter, filter_results):
+    check = message_filter.compile()
+    if filter_results is None or message_filter.key is None or message_filter.cost < FilterResults.MIN_SHARED_COST:
+        return check
+
+    return filter_results.share(message_filter.key, check)
+
+
+def _filter_cost(message_filter):
+    return message_filter.cost
+
+
+def read_message(message, field=None):
+    """
+    :param message: Message to read
+    :param field: Field of the message's payload to read, or None to read its text
+    :return: The text of the message or field, or None if the message doesn't have the field
+    """
+    if field is None:
+        return message.text
+
+    value = message.get(field)
+    return None if value is None else str(value)
@@ -1,22 +1,45 @@
 import re
 
 from doodledashboard.component import FilterCreator, MissingRequiredOptionException
-from doodledashboard.filters.filter import MessageFilter
+from doodledashboard.filters.filter import MessageFilter, read_message
 
 
 class MatchesRegexFilter(MessageFilter):
 
-    def __init__(self, regex):
+    cost = 2
+
+    def __init__(self, regex, field=None):
+        """
+        :param regex: Pattern the message has to match
+        :param field: Field of the message's payload to match instead of its text
+        """
         MessageFilter.__init__(self)
         self._regex = re.compile(regex, re.IGNORECASE)
+        self._field = field
 
     def filter(self, message):
-        return True if self._regex.search(message.text) else False
+        value = read_message(message, self._field)
+        return True if value is not None and self._regex.search(value) else False
+
+    def compile(self):
+        if self._field is not None:
+            return self.filter
+
+        search = self._regex.search
+        return lambda message: search(message.text) is not None
 
     @property
     def pattern(self):
         return self._regex.pattern
 
+    @property
+    def field(self):
+        return self._field
+
+    @property
+    def key(self):
+        return (MatchesRegexFilter, self._regex.pattern, self._field)
+
 
 class MatchesRegexFilterCreator(FilterCreator):
 
@@ -28,4 +51,4 @@ class MatchesRegexFilterCreator(FilterCreator):
         if "pattern" not in options:
             raise MissingRequiredOptionException("Expected 'pattern' option to exist")
 
-        return MatchesRegexFilter(str(options["text"]))
+        return MatchesRegexFilter(str(options["pattern"]), options.get("field"))
@@ -3,6 +3,9 @@ from doodledashboard.filters.filter import MessageFilter
 
 
 class MessageFromSourceFilter(MessageFilter):
+
+    cost = 0
+
     def __init__(self, source_name):
         MessageFilter.__init__(self)
         self._source_name = source_name
@@ -10,10 +13,18 @@ class MessageFromSourceFilter(MessageFilter):
     def filter(self, message):
         return message.source_name == self._source_name
 
+    def compile(self):
+        source_name = self._source_name
+        return lambda message: message.source_name == source_name
+
     @property
     def source_name(self):
         return self._source_name
 
+    @property
+    def selected_source(self):
+        return self._source_name
+
 
 class MessageFromSourceFilterCreator(FilterCreator):
 
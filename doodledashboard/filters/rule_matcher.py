@@ -0,0 +1,87 @@
+import re
+
+from doodledashboard.filters.contains_text import ContainsTextFilter
+from doodledashboard.filters.matches_regex import MatchesRegexFilter
+
+# An unescaped global inline flag, such as (?x) or (?s), rather than a scoped one such as (?i:...)
+_GLOBAL_FLAG = re.compile(r"(?:^|[^\\])(?:\\\\)*\(\?[aiLmsux]+\)")
+
+
+class RuleMatcher:
+    """
+    Finds the last of a list of filters that keeps a message, such as the rules choosing a notification's image.
+
+    When every filter searches the message's text for some text or a pattern, they are combined into a single regular
+    expression whose alternatives are tried from the last filter to the first, so one search decides which filter
+    wins. Otherwise, or if the filters' patterns can't be combined, each filter is tried in turn.
+    """
+
+    def __init__(self, message_filters):
+        self._filters = list(message_filters)
+        self._combined = self._combine(self._filters)
+
+    def last_match(self, message):
+        """
+        :return: Index of the last filter that keeps the message, or None if none of them keep it
+        """
+        if self._combined is None:
+            return self._last_match_of_each(message)
+
+        match = self._combined.match(message.text)
+        return int(match.lastgroup[len("rule"):]) if match else None
+
+    def _last_match_of_each(self, message):
+        last_match = None
+        for index, message_filter in enumerate(self._filters):
+            if message_filter.filter(message):
+                last_match = index
+
+        return last_match
+
+    @property
+    def combined(self):
+        """
+        :return: True if the filters were combined into a single regular expression
+        """
+        return self._combined is not None
+
+    @staticmethod
+    def _combine(message_filters):
+        alternatives = []
+        for index in reversed(range(len(message_filters))):
+            pattern = _text_pattern(message_filters[index])
+            if pattern is None:
+                return None
+
+            # Each alternative looks ahead for its filter's pattern anywhere in the text, so the alternatives are tried
+            # in order of precedence rather than by where their pattern appears in the text
+            alternatives.append(r"(?=[\s\S]*?%s)(?P<rule%d>)" % (pattern, index))
+
+        if not alternatives:
+            return None
+
+        try:
+            return re.compile("|".join(alternatives))
+        except re.error:
+            return None
+
+
+def _text_pattern(message_filter):
+    """
+    :return: Pattern matching the text kept by the filter, or None if the filter can't be expressed as one
+    """
+    if type(message_filter) is ContainsTextFilter and message_filter.field is None:
+        return "(?:%s)" % re.escape(message_filter.text)
+
+    if type(message_filter) is MatchesRegexFilter and message_filter.field is None:
+        # Capturing groups would renumber the groups of every pattern after them, breaking their backreferences
+        if re.compile(message_filter.pattern).groups:
+            return None
+
+        # Before Python 3.11, a global flag applies to the whole combined expression, changing every other pattern
+        if _GLOBAL_FLAG.search(message_filter.pattern):
+            return None
+
+        return "(?i:%s)" % message_filter.pattern
+
+    return None
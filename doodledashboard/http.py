@@ -0,0 +1,43 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = 30
+"""Seconds components should wait for a host to respond"""
+
+_POOLED_HOSTS = 16
+_CONNECTIONS_PER_HOST = 4
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Components, including those from other packages, should make their HTTP requests through this session. Its
+    connections are kept open between polls, so requesting the same host again doesn't need a new connection and TLS
+    handshake, and no more than a few requests are made to a host at once.
+    :return: The requests Session shared by every component
+    """
+    global _session
+
+    with _session_lock:
+        if not _session:
+            _session = create_session()
+
+        return _session
+
+
+def create_session(pooled_hosts=_POOLED_HOSTS, connections_per_host=_CONNECTIONS_PER_HOST):
+    """
+    :param pooled_hosts: Number of hosts to keep connections open to
+    :param connections_per_host: Most connections open to a host at once, with further requests waiting their turn
+    """
+    adapter = HTTPAdapter(pool_connections=pooled_hosts, pool_maxsize=connections_per_host, pool_block=True)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return session
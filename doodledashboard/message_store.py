@@ -0,0 +1,220 @@
+import bisect
+import hashlib
+import heapq
+import itertools
+import json
+import sqlite3
+import threading
+import time
+from operator import itemgetter
+
+from doodledashboard.datafeeds.datafeed import Message
+
+
+class MessageStore:
+    """
+    Keeps the messages polled from data-feeds so notifications can look back further than the latest poll. Each message
+    is stored once, however many polls it appears in, including stale repeats of it whilst its data-feed is unavailable,
+    and messages are evicted once there are too many or they are too old.
+
+    The newest messages are kept in memory, ordered by time. If the store has a file, messages evicted from memory for
+    lack of room are moved to an SQLite database in it instead of being dropped, which is also evicted by count and
+    age. Messages already moved to the file aren't stored again when they're polled again.
+    """
+
+    DEFAULT_MAX_MESSAGES = 1000
+
+    def __init__(self, max_messages=DEFAULT_MAX_MESSAGES, max_age=None, path=None, max_file_messages=None,
+                 clock=time.time):
+        """
+        :param max_messages: Most messages kept in memory
+        :param max_age: Seconds a message is kept for, or None to keep them until there are too many
+        :param path: SQLite file that messages evicted from memory are moved to, or None to drop them
+        :param max_file_messages: Most messages kept in the SQLite file, by default ten times max_messages
+        """
+        self._max_messages = max_messages
+        self._max_age = max_age
+        self._max_file_messages = max_file_messages or max_messages * 10
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._messages = []
+        self._fingerprints = set()
+        self._sequence = itertools.count()
+        self._spill = _SqliteSpill(path) if path else None
+
+    def add(self, messages):
+        """
+        Stores the messages that haven't been stored already
+        """
+        now = self._clock()
+
+        with self._lock:
+            new_messages = {}
+            for message in messages:
+                if message.fingerprint not in self._fingerprints:
+                    new_messages.setdefault(message.fingerprint, message)
+
+            if self._spill is not None and new_messages:
+                spilled = self._spill.contains(new_messages.values())
+                new_messages = {f: m for f, m in new_messages.items() if _spill_key(m) not in spilled}
+
+            for fingerprint, message in new_messages.items():
+                self._fingerprints.add(fingerprint)
+                bisect.insort(self._messages, (self._message_time(message, now), next(self._sequence), message))
+
+            self._evict(now)
+
+    def query(self, source_name=None, since=None, until=None, limit=None):
+        """
+        :param source_name: Name of the data-feed the messages came from, or None for every data-feed
+        :param since: Seconds since the epoch the messages have to be from or after
+        :param until: Seconds since the epoch the messages have to be from before
+        :param limit: Most messages to return, keeping the newest
+        :return: Messages, oldest first. A message's time is its timestamp, or when it was stored if it hasn't one.
+        """
+        with self._lock:
+            self._evict(self._clock())
+
+            entries = [
+                (message_time, message) for message_time, _, message in self._messages
+                if self._matches(message, message_time, source_name, since, until)
+            ]
+            if limit:
+                entries = entries[-limit:]
+
+            if self._spill is not None:
+                spilled = self._spill.query(source_name, since, until, limit)
+                entries = list(heapq.merge(spilled, entries, key=itemgetter(0)))
+
+        messages = [message for _, message in entries]
+        return messages[-limit:] if limit else messages
+
+    def __len__(self):
+        return len(self._messages) + (len(self._spill) if self._spill is not None else 0)
+
+    def _evict(self, now):
+        oldest = None if self._max_age is None else now - self._max_age
+
+        expired = 0
+        if oldest is not None:
+            expired = bisect.bisect_left(self._messages, (oldest,))
+        full = max(len(self._messages) - self._max_messages, expired)
+
+        evicted = self._messages[:full]
+        del self._messages[:full]
+        for _, _, message in evicted:
+            self._fingerprints.discard(message.fingerprint)
+
+        if self._spill is not None:
+            spilled = [(message_time, message) for message_time, _, message in evicted[expired:]]
+            self._spill.update(spilled, oldest, self._max_file_messages)
+
+    @staticmethod
+    def _message_time(message, now):
+        return message.timestamp if message.timestamp is not None else now
+
+    @staticmethod
+    def _matches(message, message_time, source_name, since, until):
+        if source_name is not None and message.source_name != source_name:
+            return False
+        if since is not None and message_time < since:
+            return False
+        if until is not None and message_time >= until:
+            return False
+
+        return True
+
+    @property
+    def max_messages(self):
+        return self._max_messages
+
+    @property
+    def max_age(self):
+        return self._max_age
+
+
+def _spill_key(message):
+    """
+    :return: Digest of the message's fingerprint, which identifies it in the SQLite file
+    """
+    return hashlib.sha1(json.dumps(message.fingerprint, default=str).encode("utf-8")).hexdigest()
+
+
+class _SqliteSpill:
+
+    _MAX_KEYS_PER_QUERY = 500
+
+    def __init__(self, path):
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS messages (time REAL, fingerprint TEXT UNIQUE, source TEXT, text TEXT, "
+            "stale INTEGER, timestamp REAL, id TEXT, payload TEXT)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS messages_by_time ON messages (time)")
+        self._connection.commit()
+
+    def contains(self, messages):
+        """
+        :return: Keys of the messages that are in the file, as made by _spill_key()
+        """
+        keys = [_spill_key(message) for message in messages]
+        found = set()
+        for start in range(0, len(keys), self._MAX_KEYS_PER_QUERY):
+            batch = keys[start:start + self._MAX_KEYS_PER_QUERY]
+            rows = self._connection.execute(
+                "SELECT fingerprint FROM messages WHERE fingerprint IN (%s)" % ", ".join("?" * len(batch)), batch
+            )
+            found.update(fingerprint for fingerprint, in rows)
+
+        return found
+
+    def update(self, entries, oldest, max_messages):
+        """
+        Adds the (time, message) entries that aren't in the file already, then evicts messages older than oldest, or
+        the oldest messages once there are more than max_messages, in a single transaction
+        """
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO messages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (message_time, _spill_key(message), message.source_name, message.text, message.stale,
+                     message.timestamp, message.id, json.dumps(dict(message.payload), default=str))
+                    for message_time, message in entries
+                ]
+            )
+
+            if oldest is not None:
+                self._connection.execute("DELETE FROM messages WHERE time < ?", (oldest,))
+
+            self._connection.execute(
+                "DELETE FROM messages WHERE rowid NOT IN (SELECT rowid FROM messages ORDER BY time DESC LIMIT ?)",
+                (max_messages,)
+            )
+
+    def query(self, source_name, since, until, limit):
+        """
+        :return: (time, message) entries, oldest first
+        """
+        conditions, parameters = [], []
+        for condition, parameter in [("source = ?", source_name), ("time >= ?", since), ("time < ?", until)]:
+            if parameter is not None:
+                conditions.append(condition)
+                parameters.append(parameter)
+
+        sql = "SELECT time, source, text, stale, timestamp, id, payload FROM messages"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY time DESC, rowid DESC"
+        if limit is not None:
+            sql += " LIMIT %d" % limit
+
+        rows = self._connection.execute(sql, parameters).fetchall()
+
+        return [
+            (message_time, Message(text, source, bool(stale), timestamp, message_id, json.loads(payload)))
+            for message_time, source, text, stale, timestamp, message_id, payload in reversed(rows)
+        ]
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
@@ -1,13 +1,15 @@
 import logging
 import os
 import tempfile
-import urllib.request
 from urllib.parse import urlparse
 
+from doodledashboard.http import get_session, DEFAULT_TIMEOUT
+
 
 class FileDownloader:
 
     _FILENAME_CHAR_WHITELIST = "abcdefghijklmnopqrstuvwxyz0123456789-_"
+    _CHUNK_SIZE = 64 * 1024
 
     def __init__(self):
         self._downloaded_files = []
@@ -22,8 +24,10 @@ class FileDownloader:
         fd, path = tempfile.mkstemp(filename)
 
         self._logger.info("Downloading %s to %s", url, path)
-        with urllib.request.urlopen(url) as response, os.fdopen(fd, "wb") as out_file:
-            out_file.write(response.read())
+        with get_session().get(url, stream=True, timeout=DEFAULT_TIMEOUT) as response, os.fdopen(fd, "wb") as out_file:
+            response.raise_for_status()
+            for chunk in response.iter_content(self._CHUNK_SIZE):
+                out_file.write(chunk)
             self._logger.info("Downloaded %s", url)
 
         self._downloaded_files.append(path)
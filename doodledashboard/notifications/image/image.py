@@ -5,6 +5,7 @@ from doodledashboard.component import MissingRequiredOptionException, Notificati
     ComponentCreationException
 from doodledashboard.filters.contains_text import ContainsTextFilter
 from doodledashboard.filters.matches_regex import MatchesRegexFilter
+from doodledashboard.filters.rule_matcher import RuleMatcher
 from doodledashboard.notifications.image.file_downloader import FileDownloader
 from doodledashboard.notifications.notification import Notification
 from doodledashboard.notifications.outputs import ImageNotificationOutput
@@ -13,6 +14,8 @@ from doodledashboard.notifications.outputs import ImageNotificationOutput
 class ImageDependingOnMessageContent(Notification):
     """
     * First message that contains text that matches an image's filter
+
+    The image's filters are combined by a RuleMatcher, so the last message is searched once for all of them.
     """
 
     def __init__(self):
@@ -20,10 +23,12 @@ class ImageDependingOnMessageContent(Notification):
         self._filtered_images = []
         self._default_image_path = None
         self._chosen_image_path = None
+        self._rule_matcher = None
 
     def add_image_filter(self, absolute_path, choice_filter=None):
         if choice_filter:
             self._filtered_images.append({"path": absolute_path, "filter": choice_filter})
+            self._rule_matcher = None
         else:
             self._default_image_path = absolute_path
 
@@ -36,9 +41,9 @@ class ImageDependingOnMessageContent(Notification):
 
         last_message = messages[-1]
 
-        for image_filter in self._filtered_images:
-            if image_filter["filter"].filter(last_message):
-                self._chosen_image_path = image_filter["path"]
+        matching_image = self._get_rule_matcher().last_match(last_message)
+        if matching_image is not None:
+            self._chosen_image_path = self._filtered_images[matching_image]["path"]
 
         if self._chosen_image_path:
             image_path = self._chosen_image_path
@@ -47,6 +52,12 @@ class ImageDependingOnMessageContent(Notification):
 
         return ImageNotificationOutput(image_path) if image_path else None
 
+    def _get_rule_matcher(self):
+        if self._rule_matcher is None:
+            self._rule_matcher = RuleMatcher([image["filter"] for image in self._filtered_images])
+
+        return self._rule_matcher
+
     @property
     def default_image(self):
         return self._default_image_path
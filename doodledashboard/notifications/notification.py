@@ -1,28 +1,58 @@
 from abc import abstractmethod
 
 from doodledashboard.component import NamedComponent
+from doodledashboard.datafeeds.datafeed import messages_from_source
+from doodledashboard.filters.filter import compile_filters
 
 
 class Notification(NamedComponent):
     """
     A notification creates an output (text, image etc) from a batch of messages that it is provided. Alternatively it
     can return None to be skipped.
+
+    Notifications whose output depends on more than their messages, such as the time, should set reuses_output to
+    False so their output is created every cycle.
     """
 
+    reuses_output = True
+
+    _created_output = False
+    _last_output = None
+    _message_store = None
+
     def __init__(self):
         super().__init__()
 
-    def create(self, messages):
+    @property
+    def message_store(self):
+        """
+        :return: MessageStore of the messages polled previously, or None if the dashboard doesn't keep them
+        """
+        return self._message_store
+
+    @message_store.setter
+    def message_store(self, message_store):
+        self._message_store = message_store
+
+    def create(self, messages, messages_changed=True):
         """
         Produces an output that is passed to the display. If the notification doesn't have anything to display then
         return None
         :param messages:
+        :param messages_changed: False if the messages are identical to those of the last call, so the last output can
+        be returned again instead of being recreated
         :return: Output or None
         """
+        if not messages_changed and self.reuses_output and self._created_output:
+            return self._last_output
+
         output = self.create_output(messages)
         if output:
             output.name = self.name
 
+        self._created_output = True
+        self._last_output = output
+
         return output
 
     @abstractmethod
@@ -44,13 +74,25 @@ class Notification(NamedComponent):
 
 class FilteredNotification(Notification):
     """
-    Filters messages prior to them being passed to the notification
+    Filters messages prior to them being passed to the notification. The filters are compiled into a single check
+    when the notification is created, sharing their results with other notifications given the same FilterResults.
+    If a filter selects the messages of a data-feed, those messages are looked up instead of checked.
     """
 
-    def __init__(self, notification, message_filters):
+    def __init__(self, notification, message_filters, filter_results=None):
         super().__init__()
         self._notification = notification
         self._message_filters = message_filters
+        self._filter_results = filter_results
+
+        source_filter = next((f for f in message_filters if f.selected_source is not None), None)
+        self._selected_source = source_filter.selected_source if source_filter else None
+        self._keep_message = compile_filters([f for f in message_filters if f is not source_filter], filter_results)
+
+    @Notification.message_store.setter
+    def message_store(self, message_store):
+        self._message_store = message_store
+        self._notification.message_store = message_store
 
     def create_output(self, messages):
         filtered_messages = self.filter_messages(messages)
@@ -60,10 +102,11 @@ class FilteredNotification(Notification):
         return self._notification.get_output_types()
 
     def filter_messages(self, messages):
-        return list(filter(self._keep_message, messages))
+        if self._filter_results is not None:
+            self._filter_results.start_batch(messages)
+
+        if self._selected_source is not None:
+            messages = messages_from_source(messages, self._selected_source)
 
-    def _keep_message(self, message):
-        for f in self._message_filters:
-            if f.filter(message) is False:
-                return False
-        return True
+        keep_message = self._keep_message
+        return [message for message in messages if keep_message(message)]
@@ -41,6 +41,7 @@ setup(
         ],
         "doodledashboard.custom.filters": [
             "contains-text=doodledashboard.filters.contains_text:ContainsTextFilterCreator",
+            "contains-any-text=doodledashboard.filters.contains_any_text:ContainsAnyTextFilterCreator",
             "matches-regex=doodledashboard.filters.matches_regex:MatchesRegexFilterCreator",
             "from-source=doodledashboard.filters.message_from_source:MessageFromSourceFilterCreator"
         ],
@@ -49,7 +50,8 @@ setup(
             "rss=doodledashboard.datafeeds.rss:RssFeedCreator",
             "slack=doodledashboard.datafeeds.slack:SlackFeedCreator",
             "text=doodledashboard.datafeeds.text:TextFeedCreator",
-            "open-weather=doodledashboard.datafeeds.open_weather:OpenWeatherCreator"
+            "open-weather=doodledashboard.datafeeds.open_weather:OpenWeatherCreator",
+            "open-weather-locations=doodledashboard.datafeeds.open_weather:OpenWeatherLocationsCreator"
         ],
         "doodledashboard.custom.notification": [
             "image-depending-on-content=doodledashboard.notifications.image.image:ImageDependingOnMessageContentCreator",
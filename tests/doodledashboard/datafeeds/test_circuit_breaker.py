@@ -0,0 +1,103 @@
+import unittest
+
+from doodledashboard.datafeeds.circuit_breaker import CircuitBreakerDataFeed
+from doodledashboard.datafeeds.datafeed import DataFeed, Message, DataFeedUnavailable
+
+
+class UnreliableFeed(DataFeed):
+
+    def __init__(self):
+        super().__init__()
+        self.available = True
+        self.calls = 0
+
+    def get_latest_messages(self):
+        self.calls += 1
+        if not self.available:
+            raise DataFeedUnavailable("Service is down")
+
+        return [Message("call %s" % self.calls)]
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreakerDataFeed(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.feed = UnreliableFeed()
+        self.breaker = CircuitBreakerDataFeed(self.feed, failure_threshold=2, backoff=10, max_backoff=25,
+                                              clock=self.clock)
+
+    def test_messages_returned_whilst_circuit_closed(self):
+        messages = self.breaker.get_messages()
+
+        self.assertEqual(CircuitBreakerDataFeed.CLOSED, self.breaker.state)
+        self.assertEqual("call 1", messages[0].text)
+
+    def test_last_messages_served_as_stale_when_feed_fails(self):
+        self.breaker.get_messages()
+        self.feed.available = False
+
+        messages = self.breaker.get_messages()
+
+        self.assertEqual("call 1", messages[0].text)
+        self.assertTrue(messages[0].stale)
+
+    def test_circuit_opens_after_consecutive_failures(self):
+        self.feed.available = False
+
+        self.breaker.get_messages()
+        self.breaker.get_messages()
+        self.breaker.get_messages()
+
+        self.assertEqual(CircuitBreakerDataFeed.OPEN, self.breaker.state)
+        self.assertEqual(2, self.feed.calls, "Feed should not be polled whilst the circuit is open")
+        self.assertEqual(10, self.breaker.seconds_until_retry)
+
+    def test_failed_probe_doubles_backoff_up_to_maximum(self):
+        self.feed.available = False
+        self.breaker.get_messages()
+        self.breaker.get_messages()
+
+        self.clock.now = 10
+        self.breaker.get_messages()
+        self.assertEqual(20, self.breaker.backoff)
+
+        self.clock.now = 30
+        self.breaker.get_messages()
+        self.assertEqual(25, self.breaker.backoff)
+        self.assertEqual(CircuitBreakerDataFeed.OPEN, self.breaker.state)
+
+    def test_successful_probe_closes_circuit(self):
+        self.feed.available = False
+        self.breaker.get_messages()
+        self.breaker.get_messages()
+
+        self.feed.available = True
+        self.clock.now = 10
+        messages = self.breaker.get_messages()
+
+        self.assertEqual(CircuitBreakerDataFeed.CLOSED, self.breaker.state)
+        self.assertEqual(0, self.breaker.failures)
+        self.assertFalse(messages[0].stale)
+
+
+class TestUnavailableDataFeed(unittest.TestCase):
+
+    def test_no_messages_returned_when_feed_unavailable_without_circuit_breaker(self):
+        feed = UnreliableFeed()
+        feed.available = False
+
+        self.assertEqual([], feed.get_messages())
+
+
+if __name__ == "__main__":
+    unittest.main()
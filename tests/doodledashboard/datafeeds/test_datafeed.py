@@ -1,6 +1,11 @@
+import asyncio
+import json
 import unittest
 
-from doodledashboard.datafeeds.datafeed import DataFeed, Message
+import pytest
+
+from doodledashboard.datafeeds.datafeed import DataFeed, Message, MessageBatch, MessageJsonEncoder, \
+    fingerprint_messages, messages_from_source
 
 
 class DummyFeed(DataFeed):
@@ -9,6 +14,12 @@ class DummyFeed(DataFeed):
         return [Message("dummy message")]
 
 
+class DummyAsyncFeed(DataFeed):
+
+    async def fetch_latest_messages(self):
+        return [Message("dummy async message")]
+
+
 class TestDataFeed(unittest.TestCase):
 
     def test_data_feed_name_set_against_messages(self):
@@ -19,6 +30,113 @@ class TestDataFeed(unittest.TestCase):
 
         self.assertEqual("dummy-feed", messages[0].source_name)
 
+    def test_async_feed_can_be_polled_synchronously(self):
+        messages = DummyAsyncFeed().get_messages()
+
+        self.assertEqual("dummy async message", messages[0].text)
+
+    def test_sync_feed_can_be_polled_from_event_loop(self):
+        dummy_feed = DummyFeed()
+        dummy_feed.name = "dummy-feed"
+
+        loop = asyncio.new_event_loop()
+        try:
+            messages = loop.run_until_complete(dummy_feed.fetch_messages())
+        finally:
+            loop.close()
+
+        self.assertEqual("dummy message", messages[0].text)
+        self.assertEqual("dummy-feed", messages[0].source_name)
+
+    def test_exception_raised_when_feed_implements_neither_method(self):
+        with self.assertRaises(NotImplementedError):
+            DataFeed().get_messages()
+
+
+class TestMessage(unittest.TestCase):
+
+    def test_message_cannot_be_changed(self):
+        with pytest.raises(AttributeError):
+            Message("text").text = "changed"
+
+    def test_message_has_no_instance_dict(self):
+        self.assertFalse(hasattr(Message("text"), "__dict__"))
+
+    def test_payload_cannot_be_changed(self):
+        payload = {"status": "Rain"}
+        message = Message("text", payload=payload)
+        payload["status"] = "Clear"
+
+        with pytest.raises(TypeError):
+            message.payload["status"] = "Snow"
+        self.assertEqual("Rain", message.get("status"))
+
+    def test_setting_source_name_deprecated(self):
+        message = Message("text", "source")
+        fingerprint = message.fingerprint
+
+        with pytest.warns(DeprecationWarning):
+            message.source_name = "other"
+
+        self.assertEqual("other", message.source_name)
+        self.assertNotEqual(fingerprint, message.fingerprint)
+
+    def test_copy_with_source_name_keeps_fields(self):
+        message = Message("text", timestamp=1.5, message_id="1", payload={"status": "Rain"})
+
+        copy = message.with_source_name("source")
+
+        self.assertEqual("source", copy.source_name)
+        self.assertEqual((1.5, "1", "Rain"), (copy.timestamp, copy.id, copy.get("status")))
+        self.assertEqual("", message.source_name)
+
+    def test_fields_included_in_json(self):
+        message = Message("text", "source", timestamp=1.5, message_id="1", payload={"status": "Rain"})
+
+        self.assertEqual(
+            {"text": "text", "source": "source", "stale": False, "timestamp": 1.5, "id": "1",
+             "payload": {"status": "Rain"}},
+            json.loads(json.dumps(message, cls=MessageJsonEncoder))
+        )
+
+    def test_identical_messages_have_same_fingerprint(self):
+        self.assertEqual(Message("text", "source", message_id="1").fingerprint,
+                         Message("text", "source", message_id="1").fingerprint)
+        self.assertNotEqual(Message("text", "source").fingerprint, Message("text", "other").fingerprint)
+
+    def test_stale_copy_has_same_fingerprint(self):
+        stale = Message("text", "source", payload={"status": "Rain"}).as_stale()
+
+        self.assertEqual(Message("text", "source", payload={"status": "Rain"}).fingerprint, stale.fingerprint)
+
+    def test_fingerprint_depends_on_payload(self):
+        self.assertEqual(Message("text", payload={"a": 1, "b": 2}).fingerprint,
+                         Message("text", payload={"b": 2, "a": 1}).fingerprint)
+        self.assertNotEqual(Message("text", payload={"temperature": 10}).fingerprint,
+                            Message("text", payload={"temperature": 11}).fingerprint)
+
+    def test_batch_fingerprint_depends_on_order(self):
+        first, second = Message("1"), Message("2")
+
+        self.assertEqual(fingerprint_messages([first, second]), fingerprint_messages([Message("1"), Message("2")]))
+        self.assertNotEqual(fingerprint_messages([first, second]), fingerprint_messages([second, first]))
+
+
+class TestMessageBatch(unittest.TestCase):
+
+    def test_messages_looked_up_by_source_in_order(self):
+        first, other, second = Message("1", "a"), Message("2", "b"), Message("3", "a")
+        batch = MessageBatch([first, other, second])
+
+        self.assertEqual([first, second], batch.from_source("a"))
+        self.assertEqual([], batch.from_source("c"))
+
+    def test_messages_from_source_found_in_list(self):
+        first, other = Message("1", "a"), Message("2", "b")
+
+        self.assertEqual([first], messages_from_source([first, other], "a"))
+        self.assertEqual([first], messages_from_source(MessageBatch([first, other]), "a"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -4,8 +4,9 @@ import pyowm
 
 import pytest
 
-from doodledashboard.component import MissingRequiredOptionException
-from doodledashboard.datafeeds.open_weather import OpenWeatherCreator, OpenWeatherFeed
+from doodledashboard.component import MissingRequiredOptionException, InvalidOptionException
+from doodledashboard.datafeeds.open_weather import OpenWeatherCreator, OpenWeatherFeed, ObservationCache, \
+    GeoLocationOption, OpenWeatherLocationsCreator, OpenWeatherLocationsFeed, WeatherLocation
 from doodledashboard.secrets_store import SecretNotFound
 
 
@@ -51,5 +52,174 @@ class TestFeed(unittest.TestCase):
         self.assertEqual(messages[0].text, 'test-detailed-status;test-status;test-temperature')
 
 
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestObservationCache(unittest.TestCase):
+
+    @staticmethod
+    def _create_client():
+        weather = Mock()
+        weather.get_status = Mock(return_value="status")
+        weather.get_detailed_status = Mock(return_value="detailed-status")
+        weather.get_temperature = Mock(return_value="temperature")
+
+        observation = Mock()
+        observation.get_weather = Mock(return_value=weather)
+
+        client = Mock()
+        client.weather_at_place = Mock(return_value=observation)
+        client.weather_at_coords = Mock(return_value=observation)
+        return client
+
+    def test_feeds_for_same_place_share_observation(self):
+        client = self._create_client()
+        cache = ObservationCache(clock=FakeClock())
+
+        OpenWeatherFeed("London, GB", None, client, cache).get_latest_messages()
+        OpenWeatherFeed("london,gb", None, client, cache).get_latest_messages()
+
+        self.assertEqual(1, client.weather_at_place.call_count)
+
+    def test_feeds_for_same_coords_share_observation(self):
+        client = self._create_client()
+        cache = ObservationCache(clock=FakeClock())
+        position = GeoLocationOption.parse_option({"lat": "51.5074", "lon": "-0.1278"})
+
+        OpenWeatherFeed(None, position, client, cache).get_latest_messages()
+        OpenWeatherFeed(None, GeoLocationOption(51.50740001, -0.1278), client, cache).get_latest_messages()
+
+        client.weather_at_coords.assert_called_once_with(51.5074, -0.1278)
+
+    def test_observation_requested_again_after_ttl(self):
+        client = self._create_client()
+        clock = FakeClock()
+        feed = OpenWeatherFeed("London,GB", None, client, ObservationCache(ttl=600, clock=clock))
+
+        feed.get_latest_messages()
+        clock.now = 599
+        feed.get_latest_messages()
+        clock.now = 600
+        feed.get_latest_messages()
+
+        self.assertEqual(2, client.weather_at_place.call_count)
+
+    def test_feed_observation_ttl_overrides_cache_ttl(self):
+        client = self._create_client()
+        clock = FakeClock()
+        feed = OpenWeatherFeed("London,GB", None, client, ObservationCache(ttl=600, clock=clock), observation_ttl=60)
+
+        feed.get_latest_messages()
+        clock.now = 60
+        feed.get_latest_messages()
+
+        self.assertEqual(2, client.weather_at_place.call_count)
+
+    def test_feeds_with_different_api_keys_do_not_share_observation(self):
+        client = self._create_client()
+        cache = ObservationCache(clock=FakeClock())
+
+        OpenWeatherFeed("London,GB", None, client, cache, api_key="first-key").get_latest_messages()
+        OpenWeatherFeed("London,GB", None, client, cache, api_key="second-key").get_latest_messages()
+        OpenWeatherFeed("London,GB", None, client, cache, api_key="first-key").get_latest_messages()
+
+        self.assertEqual(2, client.weather_at_place.call_count)
+
+    def test_exception_thrown_when_observation_ttl_not_a_number(self):
+        options = {"place-name": "London,GB", "observation-ttl": "ten minutes"}
+
+        with pytest.raises(InvalidOptionException):
+            OpenWeatherCreator().create(options, {"open-weather-map-key": "token"})
+
+
+def create_observation(city_id, name, status):
+    weather = Mock()
+    weather.get_status = Mock(return_value=status)
+    weather.get_detailed_status = Mock(return_value="detailed-" + status)
+    weather.get_temperature = Mock(return_value="temperature")
+
+    location = Mock()
+    location.get_ID = Mock(return_value=city_id)
+    location.get_name = Mock(return_value=name)
+
+    observation = Mock()
+    observation.get_weather = Mock(return_value=weather)
+    observation.get_location = Mock(return_value=location)
+    return observation
+
+
+class TestLocationsFeed(unittest.TestCase):
+
+    def test_exception_thrown_when_no_locations_in_options(self):
+        with pytest.raises(MissingRequiredOptionException):
+            OpenWeatherLocationsCreator().create({"locations": []}, {"open-weather-map-key": "token"})
+
+    def test_exception_thrown_when_location_has_no_place(self):
+        with pytest.raises(MissingRequiredOptionException):
+            OpenWeatherLocationsCreator().create({"locations": [{}]}, {"open-weather-map-key": "token"})
+
+    def test_exception_thrown_when_city_id_not_a_number(self):
+        with pytest.raises(InvalidOptionException):
+            OpenWeatherLocationsCreator().create({"locations": [{"city-id": "x"}]}, {"open-weather-map-key": "token"})
+
+    def test_city_ids_requested_together(self):
+        client = Mock()
+        client.weather_at_ids = Mock(return_value=[
+            create_observation(2643743, "London", "Rain"), create_observation(2988507, "Paris", "Clear")
+        ])
+        locations = [WeatherLocation(city_id=2643743), WeatherLocation(city_id=2988507)]
+
+        messages = OpenWeatherLocationsFeed(locations, client, ObservationCache(clock=FakeClock())).get_latest_messages()
+
+        client.weather_at_ids.assert_called_once_with([2643743, 2988507])
+        self.assertEqual(
+            ["London;detailed-Rain;Rain;temperature", "Paris;detailed-Clear;Clear;temperature"],
+            [m.text for m in messages]
+        )
+
+    def test_message_for_each_location_in_order(self):
+        client = Mock()
+        client.weather_at_ids = Mock(return_value=[create_observation(2643743, "London", "Rain")])
+        client.weather_at_place = Mock(return_value=create_observation(1, "Berlin", "Snow"))
+        client.weather_at_coords = Mock(return_value=create_observation(2, "Somewhere", "Clear"))
+        locations = [
+            WeatherLocation(place_name="Berlin,DE"),
+            WeatherLocation(city_id=2643743),
+            WeatherLocation(position=GeoLocationOption(51.5, -0.1))
+        ]
+
+        messages = OpenWeatherLocationsFeed(locations, client, ObservationCache(clock=FakeClock())).get_latest_messages()
+
+        self.assertEqual(["Berlin,DE", "London", "Somewhere"], [m.text.split(";")[0] for m in messages])
+
+    def test_city_ids_requested_in_groups_of_twenty(self):
+        client = Mock()
+        client.weather_at_ids = Mock(
+            side_effect=lambda city_ids: [create_observation(city_id, str(city_id), "Rain") for city_id in city_ids]
+        )
+        locations = [WeatherLocation(city_id=city_id) for city_id in range(45)]
+
+        messages = OpenWeatherLocationsFeed(locations, client, ObservationCache(clock=FakeClock())).get_latest_messages()
+
+        self.assertEqual([20, 20, 5], [len(call[0][0]) for call in client.weather_at_ids.call_args_list])
+        self.assertEqual(45, len(messages))
+
+    def test_cached_city_observations_not_requested_again(self):
+        client = Mock()
+        client.weather_at_ids = Mock(return_value=[create_observation(2643743, "London", "Rain")])
+        feed = OpenWeatherLocationsFeed([WeatherLocation(city_id=2643743)], client, ObservationCache(clock=FakeClock()))
+
+        feed.get_latest_messages()
+        feed.get_latest_messages()
+
+        self.assertEqual(1, client.weather_at_ids.call_count)
+
+
 if __name__ == "__main__":
     unittest.main()
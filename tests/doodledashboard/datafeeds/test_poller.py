@@ -0,0 +1,208 @@
+import asyncio
+import time
+import unittest
+
+from doodledashboard.datafeeds.datafeed import DataFeed, Message
+from doodledashboard.datafeeds.poller import SequentialPoller, ThreadedPoller, AsyncioPoller, TimeLimitedPoller
+
+
+class SlowFeed(DataFeed):
+
+    def __init__(self, text, delay):
+        super().__init__()
+        self._text = text
+        self._delay = delay
+
+    def get_latest_messages(self):
+        time.sleep(self._delay)
+        return [Message(self._text)]
+
+
+class AsyncFeed(DataFeed):
+
+    def __init__(self, text, delay):
+        super().__init__()
+        self._text = text
+        self._delay = delay
+
+    async def fetch_latest_messages(self):
+        await asyncio.sleep(self._delay)
+        return [Message(self._text)]
+
+
+class DelayedFeed(DataFeed):
+    """
+    Each poll is delayed by the next delay in the list
+    """
+
+    def __init__(self, delays):
+        super().__init__()
+        self._delays = list(delays)
+        self.calls = 0
+
+    def get_latest_messages(self):
+        self.calls += 1
+        time.sleep(self._delays.pop(0))
+        return [Message("call %s" % self.calls)]
+
+
+class DelayedAsyncFeed(DelayedFeed):
+
+    async def fetch_latest_messages(self):
+        self.calls += 1
+        await asyncio.sleep(self._delays.pop(0))
+        return [Message("call %s" % self.calls)]
+
+
+class TimeLimitedPollerTests:
+    """
+    Tests shared by the pollers that support timeouts, which provide create_poller() and create_feed()
+    """
+
+    def test_no_messages_returned_for_feed_that_times_out_before_it_ever_responds(self):
+        feed = self.create_feed([0.5])
+        feed.timeout = 0.1
+
+        messages = self.create_poller().poll([feed])
+
+        self.assertEqual([], messages)
+
+    def test_last_messages_marked_stale_when_feed_times_out(self):
+        feed = self.create_feed([0, 0.5])
+        feed.timeout = 0.1
+        poller = self.create_poller()
+
+        poller.poll([feed])
+        messages = poller.poll([feed])
+
+        self.assertEqual(["call 1"], [m.text for m in messages])
+        self.assertTrue(messages[0].stale)
+
+    def test_feed_that_timed_out_is_not_called_again_whilst_still_running(self):
+        feed = self.create_feed([0.3, 0])
+        feed.timeout = 0.1
+        poller = self.create_poller()
+
+        poller.poll([feed])
+        poller.poll([feed])
+        time.sleep(0.3)
+        messages = poller.poll([feed])
+
+        self.assertEqual(1, feed.calls)
+        self.assertEqual("call 1", messages[0].text)
+        self.assertFalse(messages[0].stale)
+
+    def test_feed_called_again_once_it_has_not_responded_for_too_long(self):
+        feed = self.create_feed([1, 0])
+        feed.timeout = 0.05
+        poller = self.create_poller(retry_after=0.1)
+
+        poller.poll([feed])
+        time.sleep(0.1)
+        messages = poller.poll([feed])
+
+        self.assertEqual(2, feed.calls)
+        self.assertEqual("call 2", messages[0].text)
+
+    def test_deadline_bounds_time_taken_by_poll(self):
+        fast_feed = self.create_feed([0])
+        slow_feed = self.create_feed([1])
+
+        start = time.monotonic()
+        messages = self.create_poller(deadline=0.2).poll([fast_feed, slow_feed])
+        duration = time.monotonic() - start
+
+        self.assertEqual(["call 1"], [m.text for m in messages])
+        self.assertLess(duration, 0.6)
+
+
+class TestSequentialPoller(unittest.TestCase):
+
+    def test_messages_returned_in_order_feeds_declared(self):
+        feeds = [SlowFeed("1", 0), SlowFeed("2", 0)]
+
+        messages = SequentialPoller().poll(feeds)
+
+        self.assertEqual(["1", "2"], [m.text for m in messages])
+
+
+class TestThreadedPoller(TimeLimitedPollerTests, unittest.TestCase):
+
+    @staticmethod
+    def create_poller(deadline=None, retry_after=TimeLimitedPoller.DEFAULT_RETRY_AFTER):
+        return ThreadedPoller(deadline=deadline, retry_after=retry_after)
+
+    @staticmethod
+    def create_feed(delays):
+        return DelayedFeed(delays)
+
+    def test_no_messages_returned_when_no_feeds(self):
+        self.assertEqual([], ThreadedPoller().poll([]))
+
+    def test_messages_returned_in_order_feeds_declared_regardless_of_which_finishes_first(self):
+        feeds = [SlowFeed("1", 0.2), SlowFeed("2", 0), SlowFeed("3", 0.1)]
+
+        messages = ThreadedPoller().poll(feeds)
+
+        self.assertEqual(["1", "2", "3"], [m.text for m in messages])
+
+    def test_feeds_polled_concurrently(self):
+        feeds = [SlowFeed(str(i), 0.2) for i in range(5)]
+
+        start = time.monotonic()
+        ThreadedPoller(max_workers=5).poll(feeds)
+        duration = time.monotonic() - start
+
+        self.assertLess(duration, 0.6, "Polling should take as long as the slowest feed, not the sum of them")
+
+    def test_source_name_set_against_messages(self):
+        feed = SlowFeed("1", 0)
+        feed.name = "slow-feed"
+
+        messages = ThreadedPoller().poll([feed])
+
+        self.assertEqual("slow-feed", messages[0].source_name)
+
+
+class TestAsyncioPoller(TimeLimitedPollerTests, unittest.TestCase):
+
+    @staticmethod
+    def create_poller(deadline=None, retry_after=TimeLimitedPoller.DEFAULT_RETRY_AFTER):
+        return AsyncioPoller(deadline=deadline, retry_after=retry_after)
+
+    @staticmethod
+    def create_feed(delays):
+        return DelayedAsyncFeed(delays)
+
+    def test_no_messages_returned_when_no_feeds(self):
+        self.assertEqual([], AsyncioPoller().poll([]))
+
+    def test_messages_from_async_and_sync_feeds_returned_in_order_feeds_declared(self):
+        feeds = [AsyncFeed("1", 0.2), SlowFeed("2", 0), AsyncFeed("3", 0), SlowFeed("4", 0.1)]
+
+        messages = AsyncioPoller().poll(feeds)
+
+        self.assertEqual(["1", "2", "3", "4"], [m.text for m in messages])
+
+    def test_async_feeds_polled_concurrently(self):
+        feeds = [AsyncFeed(str(i), 0.2) for i in range(20)]
+
+        start = time.monotonic()
+        AsyncioPoller(max_workers=1).poll(feeds)
+        duration = time.monotonic() - start
+
+        self.assertLess(duration, 0.6, "Polling should take as long as the slowest feed, not the sum of them")
+
+    def test_event_loop_reused_between_polls(self):
+        feed = AsyncFeed("1", 0)
+        feed.name = "async-feed"
+        poller = AsyncioPoller()
+
+        poller.poll([feed])
+        messages = poller.poll([feed])
+
+        self.assertEqual("async-feed", messages[0].source_name)
+
+
+if __name__ == "__main__":
+    unittest.main()
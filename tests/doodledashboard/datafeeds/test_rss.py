@@ -1,8 +1,12 @@
+import json
+import os
 import pytest
+import tempfile
 import unittest
-from doodledashboard.component import MissingRequiredOptionException
+from doodledashboard.component import MissingRequiredOptionException, InvalidOptionException
 from pytest_localserver import http
 
+from doodledashboard.datafeeds.datafeed import DataFeedUnavailable
 from doodledashboard.datafeeds.rss import RssFeed, RssFeedCreator
 
 
@@ -58,6 +62,18 @@ class TestConfig(unittest.TestCase):
         data_feed = RssFeedCreator().create(options_with_descending_order, self._EMPTY_SECRET_STORE)
         self.assertEqual("oldest", data_feed.get_sort_order())
 
+    def test_exception_raised_when_invalid_max_entries_in_options(self):
+        with pytest.raises(InvalidOptionException):
+            RssFeedCreator().create({"url": self._VALID_URL, "max-entries": 0}, self._EMPTY_SECRET_STORE)
+
+    def test_data_feed_created_with_max_entries_and_age_from_options(self):
+        options = {"url": self._VALID_URL, "max-entries": 10, "max-age": 3600}
+
+        data_feed = RssFeedCreator().create(options, self._EMPTY_SECRET_STORE)
+
+        self.assertEqual(10, data_feed.get_max_entries())
+        self.assertEqual(3600, data_feed.get_max_age())
+
 
 @pytest.mark.usefixtures
 class TestFeed(unittest.TestCase):
@@ -141,6 +157,149 @@ class TestFeed(unittest.TestCase):
         self.assertEqual("Dummy Item 2\nhttps://item/2\n2018-01-03T00:00:00+00:00", messages[1].text)
         self.assertEqual("Dummy Item 3\nhttps://item/3\n2018-01-02T00:00:00+00:00", messages[2].text)
 
+    def test_feed_unavailable_when_server_errors(self):
+        self.http_server.serve_content("", code=500)
+
+        data_feed = RssFeedCreator().create({"url": self.http_server.url}, self._EMPTY_SECRET_STORE)
+
+        with pytest.raises(DataFeedUnavailable):
+            data_feed.get_latest_messages()
+        self.assertEqual([], data_feed.get_messages())
+
+    def test_conditional_request_sent_once_feed_downloaded(self):
+        self.http_server.serve_content(TestFeed._RSS_FEED, headers={"ETag": '"v1"'})
+        data_feed = RssFeedCreator().create({"url": self.http_server.url}, self._EMPTY_SECRET_STORE)
+        data_feed.get_messages()
+
+        data_feed.get_messages()
+
+        self.assertEqual('"v1"', self.http_server.requests[-1].headers.get("If-None-Match"))
+
+    def test_previous_messages_returned_when_feed_not_modified(self):
+        self.http_server.serve_content(TestFeed._RSS_FEED, headers={"ETag": '"v1"'})
+        data_feed = RssFeedCreator().create({"url": self.http_server.url}, self._EMPTY_SECRET_STORE)
+        data_feed.get_messages()
+
+        self.http_server.serve_content("", code=304)
+        messages = data_feed.get_messages()
+
+        self.assertEqual(3, len(messages))
+        self.assertEqual("Dummy Item 1\nhttps://item/1\n2018-01-01T00:00:00+00:00", messages[0].text)
+
+    def test_cached_messages_used_after_restart(self):
+        self.http_server.serve_content(TestFeed._RSS_FEED, headers={"ETag": '"v1"'})
+        with tempfile.TemporaryDirectory() as cache_dir:
+            options = {"url": self.http_server.url, "cache-file": os.path.join(cache_dir, "feed.json")}
+            RssFeedCreator().create(options, self._EMPTY_SECRET_STORE).get_messages()
+
+            self.http_server.serve_content("", code=304)
+            messages = RssFeedCreator().create(options, self._EMPTY_SECRET_STORE).get_messages()
+
+        self.assertEqual('"v1"', self.http_server.requests[-1].headers.get("If-None-Match"))
+        self.assertEqual(3, len(messages))
+
+    def test_malformed_cache_ignored(self):
+        self.http_server.serve_content(TestFeed._RSS_FEED)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache_path = os.path.join(cache_dir, "feed.json")
+            with open(cache_path, "w") as f:
+                json.dump({"url": self.http_server.url, "etag": None, "modified": None, "messages": ["text"]}, f)
+
+            messages = RssFeedCreator().create(
+                {"url": self.http_server.url, "cache-file": cache_path}, self._EMPTY_SECRET_STORE
+            ).get_messages()
+
+        self.assertEqual(3, len(messages))
+
+    def test_unchanged_entries_reuse_their_messages(self):
+        self.http_server.serve_content(TestFeed._RSS_FEED)
+        data_feed = RssFeedCreator().create({"url": self.http_server.url}, self._EMPTY_SECRET_STORE)
+        first_messages = data_feed.get_messages()
+
+        self.http_server.serve_content(TestFeed._RSS_FEED.replace(
+            "<updated>2018-01-03T00:00:00+00:00</updated>", "<updated>2018-01-04T00:00:00+00:00</updated>"
+        ))
+        second_messages = data_feed.get_messages()
+
+        self.assertIs(first_messages[0], second_messages[0])
+        self.assertIsNot(first_messages[1], second_messages[1])
+        self.assertEqual("Dummy Item 2\nhttps://item/2\n2018-01-04T00:00:00+00:00", second_messages[1].text)
+
+    def test_newest_entries_kept_in_natural_order(self):
+        self.http_server.serve_content(TestFeed._RSS_FEED)
+        options = {"url": self.http_server.url, "max-entries": 2}
+
+        messages = RssFeedCreator().create(options, self._EMPTY_SECRET_STORE).get_messages()
+
+        self.assertEqual(["Dummy Item 2", "Dummy Item 3"], [m.text.split("\n")[0] for m in messages])
+
+    def test_newest_entries_kept_in_sort_order(self):
+        self.http_server.serve_content(TestFeed._RSS_FEED)
+        options = {"url": self.http_server.url, "max-entries": 2, "sort": "oldest"}
+
+        messages = RssFeedCreator().create(options, self._EMPTY_SECRET_STORE).get_messages()
+
+        self.assertEqual(["Dummy Item 3", "Dummy Item 2"], [m.text.split("\n")[0] for m in messages])
+
+    def test_entries_older_than_max_age_ignored(self):
+        self.http_server.serve_content(TestFeed._RSS_FEED)
+        second_of_january_2018 = 1514851200
+
+        data_feed = RssFeed(self.http_server.url, max_age=60, clock=lambda: second_of_january_2018 + 60)
+        messages = data_feed.get_messages()
+
+        self.assertEqual(["Dummy Item 2", "Dummy Item 3"], [m.text.split("\n")[0] for m in messages])
+
+    def test_entries_reaching_max_age_removed_whilst_feed_not_modified(self):
+        self.http_server.serve_content(TestFeed._RSS_FEED, headers={"ETag": '"v1"'})
+        now = [1514851200 + 60]
+        data_feed = RssFeed(self.http_server.url, max_age=60, clock=lambda: now[0])
+        data_feed.get_messages()
+
+        self.http_server.serve_content("", code=304)
+        now[0] += 86400
+        messages = data_feed.get_messages()
+
+        self.assertEqual(["Dummy Item 2"], [m.text.split("\n")[0] for m in messages])
+
+    def test_feed_read_from_file(self):
+        with tempfile.TemporaryDirectory() as feed_dir:
+            feed_path = os.path.join(feed_dir, "feed.xml")
+            with open(feed_path, "w") as f:
+                f.write(TestFeed._RSS_FEED)
+
+            from_path = RssFeed(feed_path).get_messages()
+            from_url = RssFeed("file://" + feed_path).get_messages()
+
+        self.assertEqual(3, len(from_path))
+        self.assertEqual([m.text for m in from_path], [m.text for m in from_url])
+
+    def test_streamed_feed_read_the_same_as_parsed_feed(self):
+        self.http_server.serve_content(TestFeed._RSS_FEED)
+        options = {"url": self.http_server.url, "sort": "newest"}
+
+        parsed = RssFeedCreator().create(options, self._EMPTY_SECRET_STORE).get_messages()
+        streamed = RssFeedCreator().create(dict(options, streaming=True), self._EMPTY_SECRET_STORE).get_messages()
+
+        self.assertEqual([m.text for m in parsed], [m.text for m in streamed])
+
+    def test_streamed_feed_unavailable_when_server_errors(self):
+        self.http_server.serve_content("", code=500)
+
+        data_feed = RssFeedCreator().create({"url": self.http_server.url, "streaming": True}, self._EMPTY_SECRET_STORE)
+
+        with pytest.raises(DataFeedUnavailable):
+            data_feed.get_latest_messages()
+
+    def test_entry_fields_kept_with_message(self):
+        self.http_server.serve_content(TestFeed._RSS_FEED)
+
+        message = RssFeedCreator().create({"url": self.http_server.url}, self._EMPTY_SECRET_STORE).get_messages()[0]
+
+        self.assertEqual("https://item/1", message.id)
+        self.assertEqual(1514764800, message.timestamp)
+        self.assertEqual("Dummy Item 1", message.get("title"))
+
 
 if __name__ == "__main__":
     unittest.main()
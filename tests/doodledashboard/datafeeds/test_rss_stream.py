@@ -0,0 +1,50 @@
+import unittest
+
+from doodledashboard.datafeeds.rss_stream import parse_entries
+
+
+class TestParseEntries(unittest.TestCase):
+    _ATOM_FEED = \
+        '<?xml version="1.0" encoding="utf-8"?>\
+        <feed xmlns="http://www.w3.org/2005/Atom">\
+          <title>Example Atom Feed</title>\
+          <entry>\
+            <title>Entry 1</title>\
+            <link href="https://entry/1"/>\
+            <id>urn:entry:1</id>\
+            <updated>2018-01-01T00:00:00Z</updated>\
+            <summary>First entry</summary>\
+          </entry>\
+          <entry>\
+            <title>Entry 2</title>\
+            <link href="https://entry/2"/>\
+          </entry>\
+        </feed>'
+
+    def test_atom_entry_fields_named_as_feedparser_names_them(self):
+        entry = next(parse_entries([self._ATOM_FEED]))
+
+        self.assertEqual("Entry 1", entry["title"])
+        self.assertEqual("https://entry/1", entry["link"])
+        self.assertEqual("urn:entry:1", entry["id"])
+        self.assertEqual("First entry", entry["description"])
+        self.assertEqual((2018, 1, 1), tuple(entry["updated_parsed"][:3]))
+
+    def test_document_parsed_as_chunks_arrive(self):
+        chunks = [self._ATOM_FEED[i:i + 10] for i in range(0, len(self._ATOM_FEED), 10)]
+
+        entries = list(parse_entries(chunks))
+
+        self.assertEqual(["Entry 1", "Entry 2"], [entry["title"] for entry in entries])
+
+    def test_rest_of_document_ignored_once_max_entries_read(self):
+        first_entry_end = self._ATOM_FEED.index("</entry>") + len("</entry>")
+        chunks = [self._ATOM_FEED[:first_entry_end], "<not valid xml"]
+
+        entries = list(parse_entries(chunks, max_entries=1))
+
+        self.assertEqual(["Entry 1"], [entry["title"] for entry in entries])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import asyncio
+import unittest
+
+from doodledashboard.datafeeds.datafeed import DataFeed, Message
+from doodledashboard.datafeeds.scheduled import ScheduledDataFeed
+
+
+class CountingFeed(DataFeed):
+
+    def __init__(self):
+        super().__init__()
+        self.polls = 0
+
+    def get_latest_messages(self):
+        self.polls += 1
+        return [Message("poll %s" % self.polls)]
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def no_jitter(low, high):
+    return 0
+
+
+class TestScheduledDataFeed(unittest.TestCase):
+
+    def test_feed_polled_on_first_cycle(self):
+        feed = CountingFeed()
+
+        messages = ScheduledDataFeed(feed, 60, clock=FakeClock(), get_jitter=no_jitter).get_messages()
+
+        self.assertEqual(1, feed.polls)
+        self.assertEqual("poll 1", messages[0].text)
+
+    def test_cached_messages_served_until_interval_passes(self):
+        clock = FakeClock()
+        feed = CountingFeed()
+        scheduled_feed = ScheduledDataFeed(feed, 60, clock=clock, get_jitter=no_jitter)
+
+        scheduled_feed.get_messages()
+        clock.now = 59
+        messages = scheduled_feed.get_messages()
+
+        self.assertEqual(1, feed.polls)
+        self.assertEqual("poll 1", messages[0].text)
+
+    def test_feed_polled_again_once_interval_passes(self):
+        clock = FakeClock()
+        feed = CountingFeed()
+        scheduled_feed = ScheduledDataFeed(feed, 60, clock=clock, get_jitter=no_jitter)
+
+        scheduled_feed.get_messages()
+        clock.now = 60
+        messages = scheduled_feed.get_messages()
+
+        self.assertEqual(2, feed.polls)
+        self.assertEqual("poll 2", messages[0].text)
+
+    def test_jitter_added_to_interval(self):
+        clock = FakeClock()
+        feed = CountingFeed()
+        scheduled_feed = ScheduledDataFeed(feed, 60, jitter=10, clock=clock, get_jitter=lambda low, high: high)
+
+        scheduled_feed.get_messages()
+        clock.now = 65
+        scheduled_feed.get_messages()
+
+        self.assertEqual(1, feed.polls)
+
+    def test_cached_messages_served_when_fetched_from_event_loop(self):
+        clock = FakeClock()
+        feed = CountingFeed()
+        scheduled_feed = ScheduledDataFeed(feed, 60, clock=clock, get_jitter=no_jitter)
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(scheduled_feed.fetch_messages())
+            messages = loop.run_until_complete(scheduled_feed.fetch_messages())
+        finally:
+            loop.close()
+
+        self.assertEqual(1, feed.polls)
+        self.assertEqual("poll 1", messages[0].text)
+
+    def test_name_shared_with_wrapped_feed(self):
+        feed = CountingFeed()
+        scheduled_feed = ScheduledDataFeed(feed, 60)
+
+        scheduled_feed.name = "scheduled-feed"
+
+        self.assertEqual("scheduled-feed", feed.name)
+        self.assertEqual("scheduled-feed", scheduled_feed.get_messages()[0].source_name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+
+import pytest
+
+from doodledashboard.component import InvalidOptionException
+from doodledashboard.datafeeds.slack import SlackFeed, SlackFeedCreator
+from doodledashboard.datafeeds.slack_channels import SlackChannelIndex
+from doodledashboard.datafeeds.slack_rtm import SlackRtmConnection
+
+
+class FakeSlackClient:
+
+    def __init__(self, reads):
+        self.reads = list(reads)
+        self.api_calls = []
+
+    def rtm_connect(self, with_team_state=True):
+        return True
+
+    def rtm_read(self):
+        return self.reads.pop(0) if self.reads else []
+
+    def api_call(self, method, **kwargs):
+        self.api_calls.append(method)
+        return {"ok": True, "channels": [{"id": "C1", "name": "general"}, {"id": "C2", "name": "random"}]}
+
+
+def message(text, channel):
+    return {"type": "message", "channel": channel, "text": text}
+
+
+class TestSlackFeed(unittest.TestCase):
+
+    def test_feeds_share_connection_and_channel_list(self):
+        client = FakeSlackClient([[], [message("hi general", "C1"), message("hi random", "C2")]])
+        connection = SlackRtmConnection(client)
+        channel_index = SlackChannelIndex(client)
+        general_feed = SlackFeed(["general"], connection, channel_index)
+        random_feed = SlackFeed(["random"], connection, channel_index)
+
+        self.assertEqual([], general_feed.get_latest_messages())
+        self.assertEqual(["hi random"], [m.text for m in random_feed.get_latest_messages()])
+        self.assertEqual(["hi general"], [m.text for m in general_feed.get_latest_messages()])
+        self.assertEqual(["channels.list"], client.api_calls)
+
+    def test_feeds_reading_same_channel_both_given_its_events(self):
+        client = FakeSlackClient([[], [message("hi general", "C1")]])
+        connection = SlackRtmConnection(client)
+        first_feed, second_feed = SlackFeed(["general"], connection), SlackFeed(["general"], connection)
+        first_feed.get_latest_messages()
+
+        self.assertEqual(["hi general"], [m.text for m in second_feed.get_latest_messages()])
+        self.assertEqual(["hi general"], [m.text for m in first_feed.get_latest_messages()])
+
+    def test_feed_reads_multiple_channels(self):
+        client = FakeSlackClient([[message("one", "C1"), message("two", "C2"), message("three", "C3")]])
+        feed = SlackFeed(["general", "random"], SlackRtmConnection(client))
+
+        self.assertEqual(["one", "two"], [m.text for m in feed.get_latest_messages()])
+
+    def test_events_without_text_ignored(self):
+        client = FakeSlackClient([[{"type": "message", "channel": "C1"}, {"type": "user_typing", "channel": "C1"}]])
+        feed = SlackFeed(["general"], SlackRtmConnection(client))
+
+        self.assertEqual([], feed.get_latest_messages())
+
+    def test_unknown_channel_ignored(self):
+        client = FakeSlackClient([[message("one", "C1")]])
+        feed = SlackFeed(["missing"], SlackRtmConnection(client))
+
+        self.assertEqual([], feed.get_latest_messages())
+
+
+class TestSlackFeedCreator(unittest.TestCase):
+
+    def test_unknown_overflow_policy_rejected(self):
+        options = {"token": "slack-token", "channel": "general", "overflow": "drop-everything"}
+
+        with pytest.raises(InvalidOptionException):
+            SlackFeedCreator().create(options, {"slack-token": "xoxb-token"})
+
+    def test_empty_buffer_rejected(self):
+        options = {"token": "slack-token", "channel": "general", "buffer-size": 0}
+
+        with pytest.raises(InvalidOptionException):
+            SlackFeedCreator().create(options, {"slack-token": "xoxb-token"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+
+import pytest
+
+from doodledashboard.datafeeds.slack_channels import SlackChannelIndex, SlackChannelListUnavailable
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000
+
+    def __call__(self):
+        return self.now
+
+
+class PagedSlackClient:
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+        self.ok = True
+
+    def api_call(self, method, **kwargs):
+        self.requests.append(kwargs)
+        if not self.ok:
+            return {"ok": False, "error": "ratelimited"}
+
+        page = int(kwargs.get("cursor", 0))
+        next_cursor = str(page + 1) if page + 1 < len(self.pages) else ""
+        return {"ok": True, "channels": self.pages[page], "response_metadata": {"next_cursor": next_cursor}}
+
+
+def channel(name, channel_id):
+    return {"name": name, "id": channel_id}
+
+
+class TestSlackChannelIndex(unittest.TestCase):
+
+    def test_every_page_is_indexed(self):
+        client = PagedSlackClient([[channel("general", "C1")], [channel("random", "C2")]])
+        index = SlackChannelIndex(client, clock=FakeClock())
+
+        self.assertEqual("C2", index.find_channel_id("random"))
+        self.assertEqual("C1", index.find_channel_id("general"))
+        self.assertEqual([None, "1"], [r.get("cursor") for r in client.requests])
+
+    def test_channels_downloaded_again_after_ttl(self):
+        clock = FakeClock()
+        client = PagedSlackClient([[channel("general", "C1")]])
+        index = SlackChannelIndex(client, ttl=60, clock=clock)
+
+        index.find_channel_id("general")
+        clock.now += 59
+        index.find_channel_id("general")
+        self.assertEqual(1, len(client.requests))
+
+        clock.now += 1
+        index.find_channel_id("general")
+        self.assertEqual(2, len(client.requests))
+
+    def test_missing_channel_does_not_download_channels_repeatedly(self):
+        clock = FakeClock()
+        client = PagedSlackClient([[channel("general", "C1")]])
+        index = SlackChannelIndex(client, clock=clock)
+
+        self.assertIsNone(index.find_channel_id("missing"))
+        self.assertIsNone(index.find_channel_id("missing"))
+        self.assertEqual(1, len(client.requests))
+
+        clock.now += 60
+        index.find_channel_id("missing")
+        self.assertEqual(2, len(client.requests))
+
+    def test_previous_channels_used_when_refresh_fails(self):
+        clock = FakeClock()
+        client = PagedSlackClient([[channel("general", "C1")]])
+        index = SlackChannelIndex(client, ttl=60, clock=clock)
+        index.find_channel_id("general")
+
+        client.ok = False
+        clock.now += 60
+
+        self.assertEqual("C1", index.find_channel_id("general"))
+
+    def test_error_raised_when_channels_never_listed(self):
+        client = PagedSlackClient([])
+        client.ok = False
+
+        with pytest.raises(SlackChannelListUnavailable):
+            SlackChannelIndex(client, clock=FakeClock()).find_channel_id("general")
+
+    def test_channels_persisted_between_restarts(self):
+        clock = FakeClock()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache_path = os.path.join(cache_dir, "cache", "channels.json")
+            SlackChannelIndex(PagedSlackClient([[channel("general", "C1")]]), cache_path, clock=clock)\
+                .find_channel_id("general")
+
+            restarted_client = PagedSlackClient([])
+            index = SlackChannelIndex(restarted_client, cache_path, clock=clock)
+
+            self.assertEqual("C1", index.find_channel_id("general"))
+            self.assertEqual([], restarted_client.requests)
+
+
+if __name__ == "__main__":
+    unittest.main()
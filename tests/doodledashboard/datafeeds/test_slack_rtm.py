@@ -0,0 +1,241 @@
+import threading
+import unittest
+
+import pytest
+from websocket import WebSocketConnectionClosedException
+
+from doodledashboard.datafeeds.datafeed import DataFeedUnavailable
+from doodledashboard.datafeeds.slack_rtm import SlackRtmConnection, EventBuffer, Subscription
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeServer:
+
+    def __init__(self):
+        self.pings = 0
+
+    def ping(self):
+        self.pings += 1
+
+
+class FakeSlackClient:
+
+    def __init__(self, reads=None, can_connect=True):
+        self.server = FakeServer()
+        self.reads = list(reads or [])
+        self.can_connect = can_connect
+        self.connects = 0
+        self.api_calls = []
+        self.drained = threading.Event()
+
+    def rtm_connect(self, with_team_state=True):
+        self.connects += 1
+        return self.can_connect
+
+    def rtm_read(self):
+        if not self.reads:
+            self.drained.set()
+
+        events = self.reads.pop(0) if self.reads else []
+        if isinstance(events, Exception):
+            raise events
+
+        return events
+
+    def api_call(self, method, **kwargs):
+        self.api_calls.append(method)
+        return {"ok": False, "error": "invalid_auth"}
+
+
+def message(text, channel="C1"):
+    return {"type": "message", "channel": channel, "text": text}
+
+
+def texts(events):
+    return [event["text"] for event in events]
+
+
+def subscribe(connection, *channel_ids, **kwargs):
+    subscription = connection.subscribe(**kwargs)
+    for channel_id in channel_ids:
+        connection.add_channel(subscription, channel_id)
+
+    return subscription
+
+
+class TestSlackRtmConnection(unittest.TestCase):
+
+    def test_healthy_connection_makes_no_api_calls(self):
+        client = FakeSlackClient([[message("one")], [message("two")], [message("three")]])
+        connection = SlackRtmConnection(client, FakeClock())
+        subscription = subscribe(connection, "C1")
+
+        events = [event for _ in range(3) for event in connection.take_events(subscription)]
+
+        self.assertEqual(["one", "two", "three"], texts(events))
+        self.assertEqual(1, client.connects)
+        self.assertEqual([], client.api_calls)
+
+    def test_events_queued_for_each_subscribed_channel(self):
+        client = FakeSlackClient([[message("one", "C1"), message("two", "C2"), message("ignored", "C3")]])
+        connection = SlackRtmConnection(client, FakeClock())
+        first, second = subscribe(connection, "C1"), subscribe(connection, "C2")
+
+        self.assertEqual(["one"], texts(connection.take_events(first)))
+        self.assertEqual(["two"], texts(connection.take_events(second)))
+
+    def test_events_given_to_every_subscriber_of_channel(self):
+        client = FakeSlackClient([[message("one"), message("two")]])
+        connection = SlackRtmConnection(client, FakeClock())
+        first, second = subscribe(connection, "C1", buffer_size=1), subscribe(connection, "C1")
+
+        self.assertEqual(["two"], texts(connection.take_events(first)))
+        self.assertEqual(["one", "two"], texts(connection.take_events(second)))
+
+    def test_api_test_explains_failed_connection(self):
+        client = FakeSlackClient(can_connect=False)
+
+        with pytest.raises(DataFeedUnavailable):
+            connection = SlackRtmConnection(client, FakeClock())
+            connection.take_events(subscribe(connection, "C1"))
+
+        self.assertEqual(["api.test"], client.api_calls)
+
+    def test_quiet_connection_is_pinged(self):
+        clock = FakeClock()
+        client = FakeSlackClient()
+        connection = SlackRtmConnection(client, clock)
+        subscription = subscribe(connection, "C1")
+
+        connection.take_events(subscription)
+        self.assertEqual(0, client.server.pings)
+
+        clock.now = 30
+        connection.take_events(subscription)
+        self.assertEqual(1, client.server.pings)
+
+    def test_quiet_connection_kept_when_ping_answered(self):
+        clock = FakeClock()
+        client = FakeSlackClient([[], [], [{"type": "pong"}], []])
+        connection = SlackRtmConnection(client, clock)
+        subscription = subscribe(connection, "C1")
+        connection.take_events(subscription)
+
+        for now in [120, 240, 360]:
+            clock.now = now
+            connection.take_events(subscription)
+
+        self.assertEqual(1, client.connects)
+        self.assertEqual(2, client.server.pings)
+
+    def test_connection_reconnected_when_ping_unanswered(self):
+        clock = FakeClock()
+        client = FakeSlackClient()
+        connection = SlackRtmConnection(client, clock)
+        subscription = subscribe(connection, "C1")
+        connection.take_events(subscription)
+
+        clock.now = 30
+        connection.take_events(subscription)
+
+        clock.now = 90
+        with pytest.raises(DataFeedUnavailable):
+            connection.take_events(subscription)
+
+        client.reads = [[message("back")]]
+        self.assertEqual(["back"], texts(connection.take_events(subscription)))
+        self.assertEqual(2, client.connects)
+
+    def test_connection_reconnected_after_websocket_closes(self):
+        client = FakeSlackClient([WebSocketConnectionClosedException("closed"), [message("back")]])
+        connection = SlackRtmConnection(client, FakeClock())
+        subscription = subscribe(connection, "C1")
+
+        with pytest.raises(DataFeedUnavailable):
+            connection.take_events(subscription)
+
+        self.assertEqual(["back"], texts(connection.take_events(subscription)))
+        self.assertEqual(2, client.connects)
+        self.assertNotIn("api.test", client.api_calls)
+
+    def test_background_reader_buffers_events(self):
+        client = FakeSlackClient([[message("one")], [message("two")]])
+        connection = SlackRtmConnection(client, FakeClock())
+        subscription = subscribe(connection, "C1")
+
+        connection.start()
+        client.drained.wait(5)
+        connection.stop()
+
+        self.assertEqual(["one", "two"], texts(connection.take_events(subscription)))
+
+
+class TestEventBuffer(unittest.TestCase):
+
+    def test_oldest_events_dropped_when_full(self):
+        buffer = EventBuffer(2)
+        for text in ["one", "two", "three"]:
+            buffer.append(message(text))
+
+        events, dropped = buffer.take()
+
+        self.assertEqual(["two", "three"], texts(events))
+        self.assertEqual(1, dropped)
+
+    def test_latest_events_kept_for_each_channel(self):
+        subscription = Subscription(1, Subscription.KEEP_LATEST_PER_CHANNEL)
+        subscription.add_channel("C1")
+        subscription.add_channel("C2")
+        for event in [message("one", "C1"), message("two", "C1"), message("three", "C2")]:
+            subscription.append(event)
+
+        events, dropped = subscription.take()
+
+        self.assertEqual(["two", "three"], texts(events))
+        self.assertEqual(1, dropped)
+
+    def test_events_of_each_channel_taken_in_order_they_arrived(self):
+        subscription = Subscription(2, Subscription.KEEP_LATEST_PER_CHANNEL)
+        subscription.add_channel("C1")
+        subscription.add_channel("C2")
+        for event in [message("old in C2", "C2"), message("one in C1", "C1"), message("newest in C2", "C2")]:
+            subscription.append(event)
+
+        events, dropped = subscription.take()
+
+        self.assertEqual(["old in C2", "one in C1", "newest in C2"], texts(events))
+        self.assertEqual(0, dropped)
+
+    def test_oldest_events_of_any_channel_dropped(self):
+        subscription = Subscription(1, Subscription.DROP_OLDEST)
+        subscription.add_channel("C1")
+        subscription.add_channel("C2")
+        for event in [message("one", "C1"), message("two", "C1"), message("three", "C2")]:
+            subscription.append(event)
+
+        events, dropped = subscription.take()
+
+        self.assertEqual(["three"], texts(events))
+        self.assertEqual(2, dropped)
+
+    def test_buffer_emptied_when_taken(self):
+        buffer = EventBuffer(2)
+        buffer.append(message("one"))
+        buffer.take()
+
+        events, dropped = buffer.take()
+
+        self.assertEqual([], list(events))
+        self.assertEqual(0, dropped)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+
+import pytest
+
+from doodledashboard.component import MissingRequiredOptionException, InvalidOptionException
+from doodledashboard.datafeeds.datafeed import Message
+from doodledashboard.filters.contains_any_text import ContainsAnyTextFilter, ContainsAnyTextFilterCreator, \
+    KeywordAutomaton
+from doodledashboard.filters.filter import FilterResults, compile_filters
+from doodledashboard.filters.matches_regex import MatchesRegexFilter
+
+
+class RecordingContainsAnyTextFilter(ContainsAnyTextFilter):
+
+    def __init__(self, texts, calls):
+        super().__init__(texts)
+        self._calls = calls
+
+    def compile(self):
+        check = super().compile()
+
+        def recording_check(message):
+            self._calls.append(message.text)
+            return check(message)
+
+        return recording_check
+
+
+class TestConfig(unittest.TestCase):
+    _EMPTY_OPTIONS = {}
+    _EMPTY_SECRET_STORE = {}
+
+    def test_id_is_message_contains_any_text(self):
+        self.assertEqual("message-contains-any-text", ContainsAnyTextFilterCreator().get_id())
+
+    def test_exception_raised_when_no_texts_in_options(self):
+        with pytest.raises(MissingRequiredOptionException) as err_info:
+            ContainsAnyTextFilterCreator().create(self._EMPTY_OPTIONS, self._EMPTY_SECRET_STORE)
+
+        self.assertEqual("Expected 'texts' option to exist", err_info.value.message)
+
+    def test_exception_raised_when_texts_not_a_list(self):
+        with pytest.raises(InvalidOptionException):
+            ContainsAnyTextFilterCreator().create({"texts": "rain"}, self._EMPTY_SECRET_STORE)
+
+    def test_filter_from_config_factory_configured_correctly(self):
+        text_filter = ContainsAnyTextFilterCreator().create({"texts": ["rain", 42]}, self._EMPTY_SECRET_STORE)
+
+        self.assertEqual(["rain", "42"], text_filter.texts)
+
+
+class TestFilter(unittest.TestCase):
+
+    def test_filter_true_if_message_contains_any_text(self):
+        self.assertTrue(ContainsAnyTextFilter(["snow", "rain"]).filter(Message("Light rain")))
+
+    def test_filter_false_if_message_contains_none_of_texts(self):
+        self.assertFalse(ContainsAnyTextFilter(["snow", "rain"]).filter(Message("Clear sky")))
+
+    def test_texts_found_reported(self):
+        text_filter = ContainsAnyTextFilter(["he", "she", "his", "hers"])
+
+        self.assertEqual(["she", "he", "hers"], text_filter.find_texts(Message("ushers")))
+        self.assertEqual("she", text_filter.find_first_text(Message("ushers")))
+
+    def test_field_searched_instead_of_text(self):
+        text_filter = ContainsAnyTextFilter(["rain"], field="status")
+
+        self.assertTrue(text_filter.filter(Message("Weather", payload={"status": "rain"})))
+        self.assertFalse(text_filter.filter(Message("rain")))
+
+    def test_tried_after_regex_filters(self):
+        calls = []
+        keep = compile_filters([RecordingContainsAnyTextFilter(["rain"], calls), MatchesRegexFilter("^light")])
+
+        self.assertFalse(keep(Message("Heavy rain")))
+        self.assertTrue(keep(Message("Light rain")))
+        self.assertEqual(["Light rain"], calls)
+
+    def test_results_shared_between_notifications(self):
+        calls, results = [], FilterResults()
+        keep_first = compile_filters([RecordingContainsAnyTextFilter(["rain", "snow"], calls)], results)
+        keep_second = compile_filters([RecordingContainsAnyTextFilter(["rain", "snow"], calls)], results)
+        message = Message("Light rain")
+
+        results.start_batch([message])
+
+        self.assertTrue(keep_first(message))
+        self.assertTrue(keep_second(message))
+        self.assertEqual(["Light rain"], calls)
+
+
+class TestKeywordAutomaton(unittest.TestCase):
+
+    def test_keywords_overlapping_by_suffix_found(self):
+        self.assertEqual(["c", "bcd", "abcde"], KeywordAutomaton(["abcde", "bcd", "c"]).find_all("xabcdex"))
+
+    def test_empty_keyword_found_in_any_text(self):
+        self.assertEqual("", KeywordAutomaton(["rain", ""]).find_first("sun"))
+
+
+if __name__ == '__main__':
+    unittest.main()
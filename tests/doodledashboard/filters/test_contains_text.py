@@ -35,6 +35,12 @@ class TestFilter(unittest.TestCase):
         entity = Message('1')
         self.assertTrue(ContainsTextFilter('').filter(entity))
 
+    def test_filter_searches_field(self):
+        message = Message("London;light rain", payload={"location": "London"})
+
+        self.assertTrue(ContainsTextFilter("London", "location").filter(message))
+        self.assertFalse(ContainsTextFilter("rain", "location").filter(message))
+
 
 if __name__ == '__main__':
     unittest.main()
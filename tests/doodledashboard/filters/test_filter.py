@@ -0,0 +1,113 @@
+import unittest
+
+from doodledashboard.datafeeds.datafeed import Message, MessageBatch
+from doodledashboard.filters.contains_text import ContainsTextFilter
+from doodledashboard.filters.filter import MessageFilter, FilterResults, compile_filters
+from doodledashboard.filters.matches_regex import MatchesRegexFilter
+from doodledashboard.filters.message_from_source import MessageFromSourceFilter
+from doodledashboard.notifications.notification import FilteredNotification
+from doodledashboard.notifications.text.text import TextInMessage
+
+
+class RecordingFilter(MessageFilter):
+
+    def __init__(self, cost, keep, calls):
+        super().__init__()
+        self.cost = cost
+        self._keep = keep
+        self._calls = calls
+
+    def filter(self, message):
+        self._calls.append(self.cost)
+        return self._keep
+
+    @property
+    def key(self):
+        return (RecordingFilter, self.cost, self._keep)
+
+
+class TestCompileFilters(unittest.TestCase):
+
+    def test_message_kept_when_every_filter_keeps_it(self):
+        keep = compile_filters([
+            MatchesRegexFilter("^hello"), ContainsTextFilter("world"), MessageFromSourceFilter("feed")
+        ])
+
+        self.assertTrue(keep(Message("Hello world", "feed")))
+        self.assertFalse(keep(Message("Hello world", "other-feed")))
+        self.assertFalse(keep(Message("Goodbye world", "feed")))
+
+    def test_message_kept_without_filters(self):
+        self.assertTrue(compile_filters([])(Message("Hello")))
+
+    def test_cheapest_filters_tried_first_until_message_removed(self):
+        calls = []
+        keep = compile_filters([RecordingFilter(5, True, calls), RecordingFilter(1, False, calls)])
+
+        self.assertFalse(keep(Message("Hello")))
+        self.assertEqual([1], calls)
+
+    def test_message_only_removed_when_filter_returns_false(self):
+        self.assertTrue(compile_filters([RecordingFilter(1, None, [])])(Message("Hello")))
+
+
+class TestFilterResults(unittest.TestCase):
+
+    def test_identical_filters_evaluated_once_per_message(self):
+        calls, results = [], FilterResults()
+        keep_first = compile_filters([RecordingFilter(2, True, calls)], results)
+        keep_second = compile_filters([RecordingFilter(2, True, calls)], results)
+        messages = [Message("Hello"), Message("World")]
+
+        results.start_batch(messages)
+        for message in messages:
+            keep_first(message)
+            keep_second(message)
+
+        self.assertEqual(2, len(calls))
+
+    def test_cheap_filters_not_shared(self):
+        calls, results = [], FilterResults()
+        keep_first = compile_filters([RecordingFilter(1, True, calls)], results)
+        keep_second = compile_filters([RecordingFilter(1, True, calls)], results)
+        message = Message("Hello")
+
+        results.start_batch([message])
+        keep_first(message)
+        keep_second(message)
+
+        self.assertEqual(2, len(calls))
+
+    def test_results_forgotten_for_new_batch(self):
+        calls, results = [], FilterResults()
+        keep = compile_filters([RecordingFilter(2, True, calls)], results)
+        message = Message("Hello")
+
+        results.start_batch([message])
+        keep(message)
+        results.start_batch([message])
+        keep(message)
+
+        self.assertEqual(2, len(calls))
+
+    def test_filters_with_different_options_not_shared(self):
+        self.assertNotEqual(ContainsTextFilter("a").key, ContainsTextFilter("b").key)
+        self.assertEqual(MatchesRegexFilter("a").key, MatchesRegexFilter("a").key)
+
+
+class TestFilteredNotification(unittest.TestCase):
+
+    def test_messages_from_selected_source_looked_up_then_filtered(self):
+        calls = []
+        notification = FilteredNotification(
+            TextInMessage(), [RecordingFilter(1, True, calls), MessageFromSourceFilter("a")]
+        )
+        first, other = Message("1", "a"), Message("2", "b")
+
+        self.assertEqual([first], notification.filter_messages(MessageBatch([first, other])))
+        self.assertEqual([first], notification.filter_messages([first, other]))
+        self.assertEqual(2, len(calls))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,6 +19,12 @@ class TestConfig(unittest.TestCase):
 
         self.assertEqual("Expected 'pattern' option to exist", err_info.value.message)
 
+    def test_filter_created_with_pattern_and_field_from_options(self):
+        regex_filter = MatchesRegexFilterCreator().create({"pattern": "rain", "field": "status"}, {})
+
+        self.assertEqual("rain", regex_filter.pattern)
+        self.assertEqual("status", regex_filter.field)
+
 
 class TestFilter(unittest.TestCase):
 
@@ -34,6 +40,14 @@ class TestFilter(unittest.TestCase):
         message = Message('test1 test2')
         self.assertFalse(MatchesRegexFilter('test3').filter(message))
 
+    def test_regex_matches_field(self):
+        message = Message('London;light rain', payload={"status": "Rain"})
+        self.assertTrue(MatchesRegexFilter('^rain$', "status").filter(message))
+
+    def test_regex_does_not_match_missing_field(self):
+        message = Message('Rain')
+        self.assertFalse(MatchesRegexFilter('rain', "status").filter(message))
+
 
 if __name__ == '__main__':
     unittest.main()
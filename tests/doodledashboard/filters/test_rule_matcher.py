@@ -0,0 +1,59 @@
+import unittest
+
+from doodledashboard.datafeeds.datafeed import Message
+from doodledashboard.filters.contains_text import ContainsTextFilter
+from doodledashboard.filters.matches_regex import MatchesRegexFilter
+from doodledashboard.filters.message_from_source import MessageFromSourceFilter
+from doodledashboard.filters.rule_matcher import RuleMatcher
+
+
+class TestRuleMatcher(unittest.TestCase):
+
+    def test_last_matching_filter_wins(self):
+        matcher = RuleMatcher([ContainsTextFilter("rain"), MatchesRegexFilter("^light"), ContainsTextFilter("snow")])
+
+        self.assertTrue(matcher.combined)
+        self.assertEqual(1, matcher.last_match(Message("Light rain")))
+        self.assertEqual(2, matcher.last_match(Message("Light rain and snow")))
+        self.assertIsNone(matcher.last_match(Message("Clear sky")))
+
+    def test_only_patterns_ignore_case(self):
+        matcher = RuleMatcher([ContainsTextFilter("Rain"), MatchesRegexFilter("SNOW")])
+
+        self.assertIsNone(matcher.last_match(Message("rain")))
+        self.assertEqual(1, matcher.last_match(Message("snow")))
+
+    def test_text_containing_pattern_characters_searched_literally(self):
+        matcher = RuleMatcher([ContainsTextFilter("1+1")])
+
+        self.assertEqual(0, matcher.last_match(Message("1+1=2")))
+        self.assertIsNone(matcher.last_match(Message("11")))
+
+    def test_filters_tried_in_turn_when_they_cannot_be_combined(self):
+        matcher = RuleMatcher([ContainsTextFilter("rain"), MessageFromSourceFilter("weather")])
+
+        self.assertFalse(matcher.combined)
+        self.assertEqual(1, matcher.last_match(Message("rain", "weather")))
+
+    def test_patterns_with_groups_not_combined(self):
+        matcher = RuleMatcher([MatchesRegexFilter(r"(a)\1"), ContainsTextFilter("b")])
+
+        self.assertFalse(matcher.combined)
+        self.assertEqual(0, matcher.last_match(Message("aa")))
+
+    def test_patterns_with_global_flags_not_combined(self):
+        matcher = RuleMatcher([MatchesRegexFilter("(?x) snow"), ContainsTextFilter("light rain")])
+
+        self.assertFalse(matcher.combined)
+        self.assertIsNone(matcher.last_match(Message("lightrain")))
+        self.assertEqual(1, matcher.last_match(Message("light rain and snow")))
+
+    def test_patterns_with_scoped_or_escaped_flags_combined(self):
+        matcher = RuleMatcher([MatchesRegexFilter("(?s:rain.snow)"), MatchesRegexFilter(r"\(?s\)")])
+
+        self.assertTrue(matcher.combined)
+        self.assertEqual(1, matcher.last_match(Message("(s)")))
+
+
+if __name__ == '__main__':
+    unittest.main()
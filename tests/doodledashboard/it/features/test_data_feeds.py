@@ -5,7 +5,7 @@ from click.testing import CliRunner
 
 from doodledashboard.cli import list, view
 from doodledashboard.component import DataFeedCreator, StaticComponentSource
-from doodledashboard.datafeeds.datafeed import DataFeed
+from doodledashboard.datafeeds.datafeed import DataFeed, DataFeedUnavailable
 from tests.doodledashboard.it.support import CliTestCase
 
 
@@ -25,6 +25,22 @@ class DummyFeedCreator(DataFeedCreator):
         return DummyFeed()
 
 
+class FailingFeed(DataFeed):
+
+    def get_latest_messages(self):
+        raise DataFeedUnavailable("Always fails")
+
+
+class FailingFeedCreator(DataFeedCreator):
+
+    @staticmethod
+    def get_id():
+        return "test-failing-feed"
+
+    def create(self, options, secret_storage):
+        return FailingFeed()
+
+
 class ListCommand(CliTestCase):
 
     def test_data_feed_shown_in_list_of_available_data_feeds(self):
@@ -143,6 +159,31 @@ class ViewCommand(CliTestCase):
         self.assertEqual("Test 3", data["source-data"][2]["text"], "Text in the second message should equal Test 3")
         self.assertEqual(0, result.exit_code)
 
+    def test_circuit_breaker_state_displayed(self):
+        config_with_failing_feed = """
+        dashboard:
+          data-feeds:
+            - name: Failing feed
+              type: test-failing-feed
+              circuit-breaker:
+                failure-threshold: 1
+                backoff: 60
+        """
+
+        StaticComponentSource.add(FailingFeedCreator)
+
+        runner = CliRunner()
+        with runner.isolated_filesystem():
+            self.save_file("config.yml", config_with_failing_feed)
+            result = self.call_cli(runner, view, "datafeeds config.yml")
+
+        data = json.loads(result.output)
+        self.assertEqual([], data["source-data"])
+        self.assertEqual(1, len(data["circuit-breakers"]))
+        self.assertEqual("Failing feed", data["circuit-breakers"][0]["data-feed"])
+        self.assertEqual("open", data["circuit-breakers"][0]["state"])
+        self.assertEqual(0, result.exit_code)
+
 
 if __name__ == '__main__':
     unittest.main()
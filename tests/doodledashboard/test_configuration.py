@@ -1,8 +1,13 @@
 import unittest
 
+import pytest
+
 from doodledashboard.component import DataFeedCreator
-from doodledashboard.configuration import ComponentConfigParser
+from doodledashboard.configuration import ComponentConfigParser, PollerConfigParser, InvalidConfigurationException, \
+    DataFeedComponentsConfigParser, MessageStoreConfigParser
 from doodledashboard.datafeeds.datafeed import DataFeed
+from doodledashboard.datafeeds.poller import SequentialPoller, ThreadedPoller, AsyncioPoller
+from doodledashboard.datafeeds.scheduled import ScheduledDataFeed
 
 
 class DummyFeed(DataFeed):
@@ -57,5 +62,103 @@ class TestComponentConfigParser(unittest.TestCase):
         })
 
 
+class TestDataFeedComponentsConfigParser(unittest.TestCase):
+    _EMPTY_SECRET_STORE = {}
+
+    def test_data_feed_not_scheduled_without_refresh_interval(self):
+        parser = DataFeedComponentsConfigParser([DummyFeedCreator()], self._EMPTY_SECRET_STORE)
+        data_feed = parser.parse({'type': 'test-feed'})
+
+        self.assertIsInstance(data_feed, DummyFeed)
+
+    def test_data_feed_scheduled_with_refresh_interval_and_jitter(self):
+        parser = DataFeedComponentsConfigParser([DummyFeedCreator()], self._EMPTY_SECRET_STORE)
+        data_feed = parser.parse({
+            'name': 'test-name',
+            'type': 'test-feed',
+            'refresh-interval': 600,
+            'refresh-jitter': 30
+        })
+
+        self.assertIsInstance(data_feed, ScheduledDataFeed)
+        self.assertEqual(600, data_feed.refresh_interval)
+        self.assertEqual(30, data_feed.jitter)
+        self.assertEqual('test-name', data_feed.data_feed.name)
+
+    def test_timeout_set_against_data_feed(self):
+        parser = DataFeedComponentsConfigParser([DummyFeedCreator()], self._EMPTY_SECRET_STORE)
+        data_feed = parser.parse({'type': 'test-feed', 'refresh-interval': 600, 'timeout': 5})
+
+        self.assertEqual(5, data_feed.timeout)
+
+    def test_exception_raised_for_invalid_refresh_interval(self):
+        parser = DataFeedComponentsConfigParser([DummyFeedCreator()], self._EMPTY_SECRET_STORE)
+
+        with pytest.raises(InvalidConfigurationException):
+            parser.parse({'type': 'test-feed', 'refresh-interval': 'often'})
+
+
+class TestPollerConfigParser(unittest.TestCase):
+
+    def test_sequential_poller_created_by_default(self):
+        self.assertIsInstance(PollerConfigParser().parse({}), SequentialPoller)
+
+    def test_threaded_poller_created_with_max_workers(self):
+        poller = PollerConfigParser().parse({"mode": "threads", "max-workers": 3})
+
+        self.assertIsInstance(poller, ThreadedPoller)
+        self.assertEqual(3, poller.max_workers)
+
+    def test_asyncio_poller_created(self):
+        self.assertIsInstance(PollerConfigParser().parse({"mode": "asyncio"}), AsyncioPoller)
+
+    def test_exception_raised_for_unknown_mode(self):
+        with pytest.raises(InvalidConfigurationException):
+            PollerConfigParser().parse({"mode": "unknown"})
+
+    def test_deadline_set_against_poller(self):
+        poller = PollerConfigParser().parse({"mode": "threads", "deadline": 10})
+
+        self.assertEqual(10, poller.deadline)
+
+    def test_retry_after_set_against_poller(self):
+        poller = PollerConfigParser().parse({"mode": "asyncio", "retry-after": 60})
+
+        self.assertEqual(60, poller.retry_after)
+
+    def test_exception_raised_for_deadline_in_sequential_mode(self):
+        with pytest.raises(InvalidConfigurationException):
+            PollerConfigParser().parse({"deadline": 10})
+
+    def test_background_polling_disabled_by_default(self):
+        self.assertIsNone(PollerConfigParser().parse_background_interval({}))
+
+    def test_background_polling_enabled_with_interval(self):
+        interval = PollerConfigParser().parse_background_interval({"background": True, "background-interval": 30})
+
+        self.assertEqual(30, interval)
+
+    def test_exception_raised_for_invalid_max_workers(self):
+        with pytest.raises(InvalidConfigurationException):
+            PollerConfigParser().parse({"mode": "threads", "max-workers": 0})
+
+    def test_exception_raised_for_boolean_max_workers(self):
+        with pytest.raises(InvalidConfigurationException):
+            PollerConfigParser().parse({"mode": "threads", "max-workers": True})
+
+
+class TestMessageStoreConfigParser(unittest.TestCase):
+
+    def test_message_store_created_with_limits(self):
+        store = MessageStoreConfigParser().parse({"max-messages": 50, "max-age": 3600})
+
+        self.assertEqual(50, store.max_messages)
+        self.assertEqual(3600, store.max_age)
+
+    def test_exception_raised_for_invalid_max_messages(self):
+        with pytest.raises(InvalidConfigurationException):
+            MessageStoreConfigParser().parse({"max-messages": 0})
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,167 @@
+import time
+import unittest
+
+import pytest
+
+from doodledashboard.dashboard import Dashboard, DashboardRunner, BackgroundDashboardRunner, DashboardValidator, \
+    PollerDoesNotSupportTimeouts
+from doodledashboard.datafeeds.datafeed import DataFeed, Message
+from doodledashboard.datafeeds.poller import SequentialPoller
+from doodledashboard.displays.display import Display
+from doodledashboard.message_store import MessageStore
+from doodledashboard.notifications.outputs import TextNotificationOutput
+from doodledashboard.notifications.text.text import TextInMessage
+
+
+class CountingFeed(DataFeed):
+
+    def __init__(self):
+        super().__init__()
+        self.polls = 0
+
+    def get_latest_messages(self):
+        self.polls += 1
+        return [Message(str(self.polls))]
+
+
+class SlowDisplay(Display):
+
+    def __init__(self, seconds_per_notification):
+        super().__init__()
+        self._seconds_per_notification = seconds_per_notification
+        self.drawn = []
+
+    def draw(self, notification_output):
+        self.drawn.append(notification_output.text)
+        time.sleep(self._seconds_per_notification)
+
+    @staticmethod
+    def get_supported_notifications():
+        return [TextNotificationOutput]
+
+
+class StaticFeed(DataFeed):
+
+    def get_latest_messages(self):
+        return [Message("unchanged")]
+
+
+class CountingNotification(TextInMessage):
+
+    def __init__(self):
+        super().__init__()
+        self.outputs_created = 0
+
+    def create_output(self, messages):
+        self.outputs_created += 1
+        return super().create_output(messages)
+
+
+class FailingNotification(TextInMessage):
+
+    def create_output(self, messages):
+        raise ValueError("Failed to create output")
+
+
+class RecordingDisplay(SlowDisplay):
+
+    def __init__(self):
+        super().__init__(0)
+        self.redrawn = []
+
+    def draw_unchanged(self, notification_output):
+        self.redrawn.append(notification_output.text)
+
+
+class TestDashboardRunner(unittest.TestCase):
+
+    def test_output_reused_when_messages_unchanged(self):
+        notification = CountingNotification()
+        runner = DashboardRunner(Dashboard(RecordingDisplay(), [StaticFeed()], [notification]))
+
+        runner.cycle()
+        runner.cycle()
+
+        self.assertEqual(1, notification.outputs_created)
+
+    def test_output_recreated_when_messages_change(self):
+        notification = CountingNotification()
+        runner = DashboardRunner(Dashboard(RecordingDisplay(), [CountingFeed()], [notification]))
+
+        runner.cycle()
+        runner.cycle()
+
+        self.assertEqual(2, notification.outputs_created)
+
+    def test_display_told_when_output_unchanged(self):
+        display = RecordingDisplay()
+        runner = DashboardRunner(Dashboard(display, [StaticFeed()], [TextInMessage()]))
+
+        runner.cycle()
+        runner.cycle()
+
+        self.assertEqual(["unchanged"], display.drawn)
+        self.assertEqual(["unchanged"], display.redrawn)
+
+    def test_polled_messages_kept_in_message_store(self):
+        notification = CountingNotification()
+        store = MessageStore()
+        runner = DashboardRunner(Dashboard(RecordingDisplay(), [CountingFeed()], [notification], message_store=store))
+
+        runner.cycle()
+        runner.cycle()
+
+        self.assertEqual(["1", "2"], [message.text for message in store.query()])
+        self.assertIs(store, notification.message_store)
+
+
+class TestBackgroundDashboardRunner(unittest.TestCase):
+
+    def test_outputs_replaced_only_once_drawn(self):
+        display = SlowDisplay(0.1)
+        dashboard = Dashboard(display, [CountingFeed()], [TextInMessage(), TextInMessage()])
+
+        runner = BackgroundDashboardRunner(dashboard, interval=0.02)
+        try:
+            runner.cycle()
+            runner.cycle()
+        finally:
+            runner.stop()
+
+        self.assertEqual(["1", "1", "2", "2"], display.drawn)
+
+    def test_cycle_ends_when_outputs_cannot_be_created(self):
+        display = SlowDisplay(0)
+        runner = BackgroundDashboardRunner(Dashboard(display, [CountingFeed()], [FailingNotification()]), interval=0.05)
+        try:
+            runner.cycle()
+        finally:
+            runner.stop()
+
+        self.assertEqual([], display.drawn)
+
+    def test_stop_ends_background_polling(self):
+        feed = CountingFeed()
+        runner = BackgroundDashboardRunner(Dashboard(SlowDisplay(0), [feed], []), interval=0.01)
+
+        runner.start()
+        runner.stop()
+        polls_after_stop = feed.polls
+        time.sleep(0.05)
+
+        self.assertEqual(polls_after_stop, feed.polls)
+
+
+class TestDashboardValidator(unittest.TestCase):
+
+    def test_exception_raised_when_poller_cannot_enforce_data_feed_timeout(self):
+        feed = CountingFeed()
+        feed.timeout = 5
+        dashboard = Dashboard(SlowDisplay(0), [feed], [], SequentialPoller())
+
+        with pytest.raises(PollerDoesNotSupportTimeouts):
+            DashboardValidator().validate(dashboard)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from doodledashboard.http import get_session, create_session
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.client_ports.append(self.client_address[1])
+        time.sleep(self.server.delay)
+
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RecordingServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, delay=0):
+        super().__init__(("127.0.0.1", 0), RecordingHandler)
+        self.delay = delay
+        self.client_ports = []
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:%s/" % self.server_address[1]
+
+
+class TestHttp(unittest.TestCase):
+
+    def start_server(self, delay=0):
+        server = RecordingServer(delay)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def test_components_share_session(self):
+        self.assertIs(get_session(), get_session())
+
+    def test_connection_reused_between_requests(self):
+        server = self.start_server()
+        session = create_session()
+
+        for _ in range(3):
+            session.get(server.url).close()
+
+        self.assertEqual(3, len(server.client_ports))
+        self.assertEqual(1, len(set(server.client_ports)))
+
+    def test_requests_wait_for_a_connection_to_the_host(self):
+        server = self.start_server(delay=0.1)
+        session = create_session(connections_per_host=1)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            for response in list(executor.map(session.get, [server.url] * 3)):
+                response.close()
+
+        self.assertEqual(3, len(server.client_ports))
+        self.assertEqual(1, len(set(server.client_ports)))
+
+
+if __name__ == "__main__":
+    unittest.main()
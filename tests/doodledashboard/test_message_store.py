@@ -0,0 +1,127 @@
+import os
+import tempfile
+import unittest
+
+from doodledashboard.datafeeds.datafeed import Message
+from doodledashboard.message_store import MessageStore
+
+
+class TestMessageStore(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000
+
+    def clock(self):
+        return self.now
+
+    def test_messages_stored_once(self):
+        store = MessageStore(clock=self.clock)
+        message = Message("Hello", "feed", timestamp=900)
+
+        store.add([message])
+        store.add([message])
+
+        self.assertEqual([message], store.query())
+
+    def test_stale_repeats_not_stored_again(self):
+        store = MessageStore(clock=self.clock)
+        message = Message("Hello", "feed", timestamp=900)
+
+        store.add([message])
+        store.add([message.as_stale()])
+        store.add([message])
+
+        self.assertEqual([(message.text, False)], [(m.text, m.stale) for m in store.query()])
+
+    def test_stale_repeats_of_messages_in_file_not_stored_again(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = MessageStore(max_messages=1, path=os.path.join(directory, "history.sqlite"), clock=self.clock)
+            messages = [Message("1", "feed", timestamp=1), Message("2", "feed", timestamp=2)]
+
+            store.add(messages)
+            store.add([message.as_stale() for message in messages])
+
+            self.assertEqual(2, len(store))
+
+    def test_messages_queried_by_source_and_time(self):
+        store = MessageStore(clock=self.clock)
+        old, new, other = Message("Old", "a", timestamp=100), Message("New", "a", timestamp=500), Message("B", "b")
+        store.add([old, new, other])
+
+        self.assertEqual([old, new], store.query(source_name="a"))
+        self.assertEqual([new, other], store.query(since=400))
+        self.assertEqual([old], store.query(until=500))
+        self.assertEqual([other], store.query(limit=1))
+
+    def test_oldest_messages_evicted_when_full(self):
+        store = MessageStore(max_messages=2, clock=self.clock)
+        store.add([Message("1"), Message("2"), Message("3")])
+
+        self.assertEqual(["2", "3"], [message.text for message in store.query()])
+
+    def test_messages_evicted_by_age(self):
+        store = MessageStore(max_age=60, clock=self.clock)
+        store.add([Message("Hello")])
+
+        self.now += 61
+
+        self.assertEqual([], store.query())
+        self.assertEqual(0, len(store))
+
+    def test_messages_evicted_by_age_whatever_order_they_arrive_in(self):
+        store = MessageStore(max_age=60, clock=self.clock)
+        store.add([Message("New", timestamp=990), Message("Old", timestamp=900)])
+
+        self.assertEqual(["New"], [message.text for message in store.query()])
+
+    def test_messages_queried_oldest_first(self):
+        store = MessageStore(clock=self.clock)
+        store.add([Message("2", timestamp=200), Message("1", timestamp=100)])
+        store.add([Message("0", timestamp=50)])
+
+        self.assertEqual(["0", "1", "2"], [message.text for message in store.query()])
+
+    def test_messages_moved_to_file_not_stored_again(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = MessageStore(max_messages=2, path=os.path.join(directory, "history.sqlite"), clock=self.clock)
+            messages = [Message(str(i), "feed", timestamp=i) for i in range(4)]
+
+            for _ in range(3):
+                store.add(messages)
+
+            self.assertEqual(4, len(store))
+            self.assertEqual(["0", "1", "2", "3"], [message.text for message in store.query()])
+
+    def test_messages_in_file_and_memory_queried_oldest_first(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = MessageStore(max_messages=1, path=os.path.join(directory, "history.sqlite"), clock=self.clock)
+            store.add([Message("2", timestamp=2), Message("3", timestamp=3)])
+            store.add([Message("1", timestamp=1)])
+            store.add([Message("4", timestamp=4)])
+
+            self.assertEqual(["1", "2", "3", "4"], [message.text for message in store.query()])
+            self.assertEqual(["3", "4"], [message.text for message in store.query(limit=2)])
+
+    def test_evicted_messages_moved_to_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = MessageStore(max_messages=1, path=os.path.join(directory, "history.sqlite"), clock=self.clock)
+            store.add([Message("1", "feed", timestamp=1, payload={"n": 1}), Message("2", "feed", timestamp=2)])
+
+            messages = store.query()
+
+            self.assertEqual(["1", "2"], [message.text for message in messages])
+            self.assertEqual({"n": 1}, messages[0].payload)
+            self.assertEqual(["2"], [message.text for message in store.query(limit=1)])
+            self.assertEqual(["1"], [message.text for message in store.query(until=2)])
+
+    def test_file_limited_to_max_file_messages(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "history.sqlite")
+            store = MessageStore(max_messages=1, path=path, max_file_messages=1, clock=self.clock)
+            store.add([Message(str(i), timestamp=i) for i in range(5)])
+
+            self.assertEqual(["3", "4"], [message.text for message in store.query()])
+
+
+if __name__ == "__main__":
+    unittest.main()